@@ -3,63 +3,174 @@
 It sets up the platforms for various PetLibro devices such as feeders and fountains.
 """
 
-from custom_components.petlibro.devices.feeders.feeder import Feeder
-from custom_components.petlibro.devices.fountains.dockstream_smart_fountain import (
-    DockstreamSmartFountain,
-)
+from datetime import datetime
+from functools import cache, partial
+from logging import getLogger
+from time import perf_counter
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import config_validation as cv, device_registry as dr
 from homeassistant.helpers.device_registry import DeviceEntry
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.typing import ConfigType
 
-from .const import DOMAIN
+from .const import CONF_PUSH_TOPIC, DOMAIN, SIGNAL_HUB_LOADED
 from .devices import Device
-from .devices.feeders.granary_feeder import GranaryFeeder
-from .hub import PetLibroHub
+from .history import HISTORY_SYNC_INTERVAL, PetLibroHistory
+from .hub import (
+    ENDPOINT_PROBE_INTERVAL,
+    EVENT_DEVICES_ADDED,
+    EVENT_DEVICES_REMOVED,
+    PetLibroHub,
+)
+from .services import async_setup_services
+from .transport import MqttTransport
+from .websocket import async_setup_websocket_api
 
 type PetLibroHubConfigEntry = ConfigEntry[PetLibroHub]
 
-PLATFORMS_BY_TYPE = {
-    Feeder: (Platform.SWITCH),
-    GranaryFeeder: (Platform.SENSOR),
-    DockstreamSmartFountain: (
-        Platform.SENSOR,
-        Platform.BINARY_SENSOR,
-    ),
-}
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+_LOGGER = getLogger(__name__)
+
+
+@cache
+def get_platforms_for_type(device_type: type[Device]) -> frozenset[Platform]:
+    """Get the platforms declared by a device class and its bases."""
+    return frozenset(
+        platform
+        for base in device_type.__mro__
+        for platform in vars(base).get("platforms", ())
+    )
 
 
 def get_platforms_for_devices(devices: list[Device]) -> set[Platform]:
     """Get platforms for devices."""
     return {
         platform
-        for device in devices
-        for device_type, platforms in PLATFORMS_BY_TYPE.items()
-        if isinstance(device, device_type)
-        for platform in platforms
+        for device_type in {type(device) for device in devices}
+        for platform in get_platforms_for_type(device_type)
     }
 
 
+async def async_setup(hass: HomeAssistant, _: ConfigType) -> bool:
+    """Set up the PetLibro services and websocket API."""
+    await async_setup_services(hass)
+    async_setup_websocket_api(hass)
+    return True
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: PetLibroHubConfigEntry) -> bool:
     """Set up platform from a ConfigEntry."""
-    hub = PetLibroHub(hass, entry.data)
-
-    await hub.load_devices()
+    start = perf_counter()
+    hub = PetLibroHub(hass, entry.entry_id, entry.data, entry.options)
+
+    await hub.async_probe_endpoints()
+    entry.async_on_unload(
+        async_track_time_interval(
+            hass, hub.async_probe_endpoints, ENDPOINT_PROBE_INTERVAL
+        )
+    )
+    try:
+        await hub.load_devices()
+    except Exception:
+        # A failed setup is never unloaded, release what was loaded
+        await hub.async_shutdown()
+        raise
+    loaded = perf_counter()
 
     entry.runtime_data = hub
+    # Let the live subscriptions follow the hub, after a reload too
+    async_dispatcher_send(hass, SIGNAL_HUB_LOADED, hub)
 
     if platforms := get_platforms_for_devices(hub.devices):
         await hass.config_entries.async_forward_entry_setups(entry, platforms)
+
+    _LOGGER.debug(
+        "Set up %d devices in %.3fs (loading %.3fs, platforms %s %.3fs)",
+        len(hub.devices),
+        perf_counter() - start,
+        loaded - start,
+        sorted(platforms),
+        perf_counter() - loaded,
+    )
+
+    @callback
+    def devices_added(devices: list[Device]) -> None:
+        entry.async_create_task(hass, async_add_devices(hass, entry, devices))
+
+    entry.async_on_unload(hub.events.on(EVENT_DEVICES_ADDED, devices_added))
+    entry.async_on_unload(
+        hub.events.on(
+            EVENT_DEVICES_REMOVED, partial(async_remove_devices, hass, entry)
+        )
+    )
+
+    if topic := entry.options.get(CONF_PUSH_TOPIC):
+        # Polling slows down while push is connected, the hub stops it on unload
+        await hub.async_start_push(MqttTransport(hass, topic))
+
+    history = PetLibroHistory(hass, hub)
+
+    async def sync_history(_: datetime | None = None) -> None:
+        await history.async_sync_all()
+
+    entry.async_create_background_task(hass, sync_history(), f"{DOMAIN} history")
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+    entry.async_on_unload(
+        async_track_time_interval(hass, sync_history, HISTORY_SYNC_INTERVAL)
+    )
     return True
 
 
+async def async_add_devices(
+    hass: HomeAssistant, entry: PetLibroHubConfigEntry, devices: list[Device]
+) -> None:
+    """Add the entities of devices found after setup, without a reload."""
+    hub = entry.runtime_data
+    platforms = get_platforms_for_devices(devices)
+    for platform in platforms & hub.entity_adders.keys():
+        hub.entity_adders[platform](devices)
+    if missing := platforms - hub.entity_adders.keys():
+        # The new platforms set up the entities of every device of the hub
+        await hass.config_entries.async_forward_entry_setups(entry, missing)
+
+
+@callback
+def async_remove_devices(
+    hass: HomeAssistant, entry: PetLibroHubConfigEntry, devices: list[Device]
+) -> None:
+    """Remove the devices gone from the account, along with their entities."""
+    registry = dr.async_get(hass)
+    for device in devices:
+        if device_entry := registry.async_get_device({(DOMAIN, device.serial)}):
+            registry.async_update_device(
+                device_entry.id, remove_config_entry_id=entry.entry_id
+            )
+
+
+async def async_reload_entry(
+    hass: HomeAssistant, entry: PetLibroHubConfigEntry
+) -> None:
+    """Reload a config entry when its options change."""
+    # Reauth updates the data and reloads the entry itself
+    if entry.options != entry.runtime_data.options:
+        await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(
     hass: HomeAssistant, entry: PetLibroHubConfigEntry
 ) -> bool:
     """Unload a config entry."""
-    platforms = get_platforms_for_devices(entry.runtime_data.devices)
-    return await hass.config_entries.async_unload_platforms(entry, platforms)
+    hub = entry.runtime_data
+    # Platforms loaded for devices since removed are unloaded too
+    platforms = get_platforms_for_devices(hub.devices) | hub.entity_adders.keys()
+    if unloaded := await hass.config_entries.async_unload_platforms(entry, platforms):
+        await hub.async_shutdown()
+    return unloaded
 
 
 async def async_remove_config_entry_device(
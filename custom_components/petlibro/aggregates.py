@@ -0,0 +1,198 @@
+"""Fleet-wide aggregates of PETLIBRO devices, maintained incrementally."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import partial
+from typing import TYPE_CHECKING, Any, Literal
+
+from .devices import Device
+from .devices.event import EVENT_UPDATE, Event
+
+# Sums and their terms are rounded so converted quantities do not drift
+SUM_PRECISION = 6
+
+if TYPE_CHECKING:
+    from .devices.fountains.dockstream_smart_fountain import DockstreamSmartFountain
+
+
+@dataclass(frozen=True)
+class Aggregate:
+    """An aggregate over the devices of a type.
+
+    The device type is given by class name so the model modules are only
+    imported when the account has such a device. ``data_keys`` are the raw
+    data keys ``value_fn`` depends on, the aggregate is only updated when
+    one of them changes. When ``unit_fn`` is given, only the devices sharing
+    the unit of the first device aggregated with a known unit are counted.
+    """
+
+    key: str
+    device_type: str
+    data_keys: frozenset[str]
+    value_fn: Callable[[Any], float | None]
+    kind: Literal["sum", "min"] = "sum"
+    unit_fn: Callable[[Any], str | None] | None = None
+
+    def applies_to(self, device: Device) -> bool:
+        """Return whether a device is of the aggregated type."""
+        return device.is_type(self.device_type)
+
+
+def _maintenance_required(fountain: DockstreamSmartFountain) -> float:
+    """Return 1 if the fountain needs cleaning or a new filter."""
+    days = (fountain.days_before_cleaning, fountain.days_before_filter_replacement)
+    return float(any(day is not None and day <= 0 for day in days))
+
+
+AGGREGATES: tuple[Aggregate, ...] = (
+    Aggregate(
+        key="total_feeding_quantity",
+        device_type="GranaryFeeder",
+        data_keys=frozenset({"grainStatus", "unitType"}),
+        value_fn=lambda feeder: feeder.today_feeding_quantity,
+        unit_fn=lambda feeder: feeder.unit_type,
+    ),
+    Aggregate(
+        key="total_water_consumption",
+        device_type="DockstreamSmartFountain",
+        data_keys=frozenset({"todayTotalMl"}),
+        value_fn=lambda fountain: fountain.today_water_consumption,
+    ),
+    Aggregate(
+        key="minimum_water_level",
+        device_type="DockstreamSmartFountain",
+        data_keys=frozenset({"weightPercent"}),
+        value_fn=lambda fountain: fountain.water_level,
+        kind="min",
+    ),
+    Aggregate(
+        key="maintenance_required",
+        device_type="DockstreamSmartFountain",
+        data_keys=frozenset({"remainingCleaningDays", "remainingReplacementDays"}),
+        value_fn=_maintenance_required,
+    ),
+)
+
+
+class FleetAggregates(Event):
+    """Aggregates updated from the per-device changes, never by a full rescan.
+
+    Sums are adjusted by the difference between a device's new and previous
+    contribution. A minimum is only recomputed when the device holding it
+    goes up or leaves. An update event is emitted with the changed
+    aggregate keys.
+
+    The unit of an aggregate is pinned by the first device aggregated with
+    a known unit, devices in another unit do not contribute until they
+    switch to it. When the pinning device leaves or changes its unit, the
+    unit is pinned again and the devices are counted again.
+    """
+
+    def __init__(self, aggregates: tuple[Aggregate, ...] = AGGREGATES) -> None:
+        """Initialize empty aggregates."""
+        super().__init__()
+        self.aggregates = aggregates
+        self.values: dict[str, float | None] = {
+            aggregate.key: None if aggregate.kind == "min" else 0.0
+            for aggregate in aggregates
+        }
+        self.units: dict[str, str | None] = {}
+        self._pinned_by: dict[str, str] = {}
+        self._devices: dict[str, Device] = {}
+        self._contributions: dict[str, dict[str, float]] = {
+            aggregate.key: {} for aggregate in aggregates
+        }
+        self._unsubscribes: dict[str, list[Callable[[], None]]] = {}
+
+    def add_device(self, device: Device) -> None:
+        """Start aggregating a device."""
+        if device.serial in self._unsubscribes:
+            return
+        self._devices[device.serial] = device
+        unsubscribes = self._unsubscribes[device.serial] = []
+        for aggregate in self.aggregates:
+            if aggregate.applies_to(device):
+                unsubscribes.append(
+                    device.on(
+                        EVENT_UPDATE,
+                        partial(self._update, aggregate, device),
+                        keys=aggregate.data_keys,
+                    )
+                )
+                self._update(aggregate, device)
+
+    def remove_device(self, device: Device) -> None:
+        """Stop aggregating a device and remove its contributions."""
+        for unsubscribe in self._unsubscribes.pop(device.serial, []):
+            unsubscribe()
+        self._devices.pop(device.serial, None)
+        for aggregate in self.aggregates:
+            if device.serial in self._contributions[aggregate.key]:
+                self._apply(aggregate, device.serial, None)
+            if self._pinned_by.get(aggregate.key) == device.serial:
+                self._repin(aggregate)
+
+    def _update(self, aggregate: Aggregate, device: Device) -> None:
+        """Apply the new contribution of a device."""
+        try:
+            value = aggregate.value_fn(device)
+        except (TypeError, ValueError):
+            value = None
+        if aggregate.unit_fn is not None:
+            unit = aggregate.unit_fn(device)
+            pinned_by = self._pinned_by.get(aggregate.key)
+            if pinned_by is None and unit is not None:
+                self._pinned_by[aggregate.key] = device.serial
+                self._set_unit(aggregate, unit)
+            elif pinned_by == device.serial and unit != self.units[aggregate.key]:
+                self._repin(aggregate)
+                return
+            if unit is None or unit != self.units.get(aggregate.key):
+                value = None
+        self._apply(aggregate, device.serial, value)
+
+    def _repin(self, aggregate: Aggregate) -> None:
+        """Pin the unit of an aggregate again and count the devices again."""
+        del self._pinned_by[aggregate.key]
+        self._set_unit(aggregate, None)
+        for device in tuple(self._devices.values()):
+            if aggregate.applies_to(device):
+                self._update(aggregate, device)
+
+    def _set_unit(self, aggregate: Aggregate, unit: str | None) -> None:
+        """Set the unit of an aggregate, emitting an update when it changes."""
+        if self.units.get(aggregate.key) != unit:
+            self.units[aggregate.key] = unit
+            self.emit(EVENT_UPDATE, keys={aggregate.key})
+
+    def _apply(self, aggregate: Aggregate, serial: str, value: float | None) -> None:
+        """Replace the contribution of a device and adjust the aggregate."""
+        contributions = self._contributions[aggregate.key]
+        if value is not None and aggregate.kind == "sum":
+            value = round(value, SUM_PRECISION)
+        old = contributions.get(serial)
+        if value == old:
+            return
+        if value is None:
+            del contributions[serial]
+        else:
+            contributions[serial] = value
+
+        current = self.values[aggregate.key]
+        if aggregate.kind == "min":
+            if value is not None and (current is None or value <= current):
+                new = value
+            elif old is not None and old == current:
+                new = min(contributions.values(), default=None)
+            else:
+                new = current
+        else:
+            new = round(
+                (current or 0.0) + (value or 0.0) - (old or 0.0), SUM_PRECISION
+            )
+
+        if new != current:
+            self.values[aggregate.key] = new
+            self.emit(EVENT_UPDATE, keys={aggregate.key})
@@ -1,25 +1,31 @@
 "Standalone PETLIBRO API"
+from asyncio import gather
 from logging import getLogger
 from hashlib import md5
+from time import monotonic
 from urllib.parse import urljoin
-from typing import Any, Dict, List, TypeAlias
+from typing import Any, Callable, Dict, List, TypeAlias
 
-from aiohttp import ClientSession
+from aiohttp import ClientError, ClientSession
 from homeassistant.exceptions import ConfigEntryAuthFailed
 
-from .exceptions import PetLibroAPIError, PetLibroInvalidAuth
+from .endpoints import EndpointSelector
+from .exceptions import PetLibroAPIError, PetLibroInvalidAuth, PetLibroServerError
 
 
 JSON: TypeAlias = dict[str, "JSON"] | list["JSON"] | str | int | float | bool | None
 _LOGGER = getLogger(__name__)
+# Called with the method, URL, status (None on a network error) and duration of a request
+RequestListener: TypeAlias = Callable[[str, str, int | None, float], None]
 
 
 class PetLibroSession:
     """PetLibro AIOHTTP session"""
-    def __init__(self, base_url: str, websession: ClientSession, token : str | None = None):
-        self.base_url = base_url
+    def __init__(self, endpoints: EndpointSelector, websession: ClientSession, token : str | None = None):
+        self.endpoints = endpoints
         self.websession = websession
         self.token = token
+        self.request_listeners: set[RequestListener] = set()
         self.headers = {
             "source": "ANDROID",
             "language": "EN",
@@ -27,9 +33,15 @@ class PetLibroSession:
             "version": "1.3.45",
         }
 
-    async def request(self, method: str, url: str, **kwargs: Any) -> JSON:
-        """Make a request."""
-        joined_url = urljoin(self.base_url, url)
+    @property
+    def base_url(self) -> str:
+        """The endpoint currently used"""
+        return self.endpoints.current
+
+    async def request(self, method: str, url: str, base_url: str | None = None, **kwargs: Any) -> JSON:
+        """Make a request, on the current endpoint unless one is given."""
+        base_url = base_url or self.endpoints.current
+        joined_url = urljoin(base_url, url)
         _LOGGER.debug("Making %s request to %s", method, joined_url)
 
         if "headers" not in kwargs:
@@ -47,31 +59,69 @@ class PetLibroSession:
         if "json" not in kwargs:
             kwargs["json"] = {}
 
-        async with self.websession.request(method, joined_url, **kwargs) as resp:
-            if resp.status != 200:
-                raise PetLibroAPIError(resp.content)
-
-            data = await resp.json()
+        start = monotonic()
+        status = None
+        try:
+            async with self.websession.request(method, joined_url, **kwargs) as resp:
+                status = resp.status
+                if resp.status >= 500:
+                    self.endpoints.report_failure(base_url)
+                    raise PetLibroServerError(f"Server error: {resp.status}")
+                if resp.status != 200:
+                    raise PetLibroAPIError(resp.content)
+
+                data = await resp.json()
+        except (ClientError, TimeoutError):
+            self.endpoints.report_failure(base_url)
+            raise
+        finally:
+            for listener in tuple(self.request_listeners):
+                listener(method, joined_url, status, monotonic() - start)
+        self.endpoints.report_success(base_url, monotonic() - start)
+
+        _LOGGER.debug(
+            "Received %s response from %s: %s", resp.status, joined_url, data
+        )
+
+        if not data:
+            raise PetLibroAPIError("No JSON data")
+
+        if data.get("code") == 1102:
+            raise PetLibroInvalidAuth()
+
+        if data.get("code") == 1009:
+            raise ConfigEntryAuthFailed(data.get("msg"))
+
+        # Catch all other non 0 code
+        if data.get("code") != 0:
+            raise PetLibroAPIError(f"Code: {data.get('code')}, Message: {data.get('msg')}")
+
+        return data.get("data")
+
+    async def get_file(self, url: str, etag: str | None = None,
+                       last_modified: str | None = None) -> tuple[bytes | None, str | None, str | None]:
+        """
+        Download a file, unless it did not change since the given validators
 
-            _LOGGER.debug(
-                "Received %s response from %s: %s", resp.status, joined_url, data
+        :return: The content (None if not modified), ETag and Last-Modified
+        """
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+        async with self.websession.get(url, headers=headers) as resp:
+            if resp.status == 304:
+                return None, etag, last_modified
+            if resp.status != 200:
+                raise PetLibroAPIError(f"Unable to download file: {resp.status}")
+            return (
+                await resp.read(),
+                resp.headers.get("ETag"),
+                resp.headers.get("Last-Modified"),
             )
 
-            if not data:
-                raise PetLibroAPIError("No JSON data")
-
-            if data.get("code") == 1102:
-                raise PetLibroInvalidAuth()
-
-            if data.get("code") == 1009:
-                raise ConfigEntryAuthFailed(data.get("msg"))
-
-            # Catch all other non 0 code
-            if data.get("code") != 0:
-                raise PetLibroAPIError(f"Code: {data.get('code')}, Message: {data.get('msg')}")
-
-            return data.get("data")
-
     async def post(self, path: str, **kwargs: Any) -> JSON:
         """Post on PetLibro API"""
         return await self.request("POST", path, **kwargs)
@@ -92,13 +142,15 @@ class PetLibroAPI:
     APPID = 1
     APPSN = "c35772530d1041699c87fe62348507a8"
     API_URLS = {
-        "US": "https://api.us.petlibro.com"
+        "US": ["https://api.us.petlibro.com"]
     }
 
     def __init__(self, session: ClientSession, time_zone: str, region: str,
-                 token: str | None = None) -> None:
+                 token: str | None = None, endpoints: list[str] | None = None) -> None:
         """Initialize."""
-        self.session = PetLibroSession(self.API_URLS[region], session, token)
+        self.session = PetLibroSession(
+            EndpointSelector(endpoints or self.API_URLS[region]), session, token
+        )
         self.region = region
         self.time_zone = time_zone
 
@@ -145,6 +197,22 @@ class PetLibroAPI:
         await self.session.post("/member/auth/logout")
         self.session.token = None
 
+    async def probe_endpoints(self) -> str:
+        """
+        Measure the latency of every endpoint serving the account and use the fastest
+
+        :return: The selected endpoint
+        """
+        async def probe(url: str) -> None:
+            try:
+                await self.session.post("/device/device/list", base_url=url)
+            except (PetLibroAPIError, ConfigEntryAuthFailed, ClientError, TimeoutError) as ex:
+                _LOGGER.debug("Endpoint %s failed its probe: %s", url, ex)
+                self.session.endpoints.mark_down(url)
+
+        await gather(*(probe(url) for url in self.session.endpoints.candidates))
+        return self.session.endpoints.select()
+
     async def list_devices(self) -> List[dict]:
         """
         List all account devices
@@ -166,6 +234,38 @@ class PetLibroAPI:
     async def device_feeding_plan_today_new(self, serial: str) -> Dict[str, Any]:
         return await self.session.post_serial("/device/feedingPlan/todayNew", serial)  # type: ignore
 
+    async def device_last_picture(self, serial: str) -> str | None:
+        """
+        Get the URL of the last camera picture of the device
+
+        :raises PetLibroAPIError: In case of API error
+        """
+        data = await self.session.post_serial("/device/video/getLastPicture", serial)
+        if isinstance(data, dict):
+            return data.get("url")  # type: ignore
+        return data  # type: ignore
+
+    async def device_work_records(self, serial: str, start: int, end: int,
+                                  types: list[str], size: int = 50) -> List[dict]:
+        """
+        List the device work records (feedings, drinkings...) of a time range
+
+        :param serial: The device serial
+        :param start: Range start timestamp in milliseconds
+        :param end: Range end timestamp in milliseconds
+        :param types: Record types to list
+        :param size: Maximum number of records
+        :raises PetLibroAPIError: In case of API error
+        :return: List of records grouped by day
+        """
+        return await self.session.post("/device/workRecord/list", json={
+            "deviceSn": serial,
+            "startTime": start,
+            "endTime": end,
+            "size": size,
+            "type": types
+        })  # type: ignore
+
     async def set_device_feeding_plan(self, serial: str, enable: bool):
         await self.session.post("/device/setting/updateFeedingPlanSwitch", json={
             "deviceSn": serial,
@@ -3,7 +3,6 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from functools import cached_property
 from logging import getLogger
 
 from homeassistant.components.binary_sensor import (
@@ -11,13 +10,19 @@ from homeassistant.components.binary_sensor import (
     BinarySensorEntity,
     BinarySensorEntityDescription,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.const import Platform
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from . import PetLibroHubConfigEntry
 from .devices import Device
-from .devices.fountains.dockstream_smart_fountain import DockstreamSmartFountain
-from .entity import PetLibroEntity, PetLibroEntityDescription, _DeviceT
+from .devices.alerts import EVENT_ALERT, AlertRule
+from .entity import (
+    DescriptionIndex,
+    PetLibroEntity,
+    PetLibroEntityDescription,
+    _DeviceT,
+)
 
 _LOGGER = getLogger(__name__)
 
@@ -34,23 +39,21 @@ class PetLibroBinarySensorEntity(PetLibroEntity[_DeviceT], BinarySensorEntity):
 
     entity_description: PetLibroBinarySensorEntityDescription[_DeviceT]
 
-    @cached_property
+    @property
     def is_on(self) -> bool | None:
         """Return true if switch is on."""
-        return bool(getattr(self.device, self.entity_description.key))
+        return bool(self.value)
 
 
-DEVICE_BINARY_SENSOR_MAP: dict[
-    type[Device], list[PetLibroBinarySensorEntityDescription]
-] = {
-    DockstreamSmartFountain: [
-        PetLibroBinarySensorEntityDescription[DockstreamSmartFountain](
+DEVICE_BINARY_SENSOR_MAP: dict[str, list[PetLibroBinarySensorEntityDescription]] = {
+    "DockstreamSmartFountain": [
+        PetLibroBinarySensorEntityDescription["DockstreamSmartFountain"](
             key="filter_replacement_required",
             translation_key="filter_replacement_required",
             icon="mdi:filter-remove",
             device_class=BinarySensorDeviceClass.PROBLEM,
         ),
-        PetLibroBinarySensorEntityDescription[DockstreamSmartFountain](
+        PetLibroBinarySensorEntityDescription["DockstreamSmartFountain"](
             key="cleaning_required",
             translation_key="cleaning_required",
             icon="mdi:spray-bottle",
@@ -58,6 +61,60 @@ DEVICE_BINARY_SENSOR_MAP: dict[
         ),
     ],
 }
+DEVICE_BINARY_SENSOR_DESCRIPTIONS = DescriptionIndex(DEVICE_BINARY_SENSOR_MAP)
+
+
+class PetLibroAlertBinarySensorEntity(PetLibroBinarySensorEntity[_DeviceT]):
+    """PETLIBRO alert binary sensor entity."""
+
+    @property
+    def is_on(self) -> bool | None:
+        """Return true if the alert is active."""
+        if self.device.alerts is None:
+            return None
+        return self.device.alerts.active.get(self.entity_description.key)
+
+    async def async_added_to_hass(self) -> None:
+        """Set up a listener for the alert."""
+        await super().async_added_to_hass()
+        self.async_on_remove(self.device.on(EVENT_ALERT, self._async_alert_changed))
+
+    @callback
+    def _async_alert_changed(self, rule: AlertRule, _: bool) -> None:
+        """Write the state when the alert of this entity changes."""
+        if rule.key == self.entity_description.key:
+            self.async_write_ha_state()
+
+
+ALERT_BINARY_SENSORS: dict[str, PetLibroBinarySensorEntityDescription] = {
+    description.key: description
+    for description in (
+        PetLibroBinarySensorEntityDescription[Device](
+            key="low_water_level",
+            translation_key="low_water_level",
+            icon="mdi:water-alert",
+            device_class=BinarySensorDeviceClass.PROBLEM,
+        ),
+        PetLibroBinarySensorEntityDescription[Device](
+            key="low_remaining_water",
+            translation_key="low_remaining_water",
+            icon="mdi:water-alert",
+            device_class=BinarySensorDeviceClass.PROBLEM,
+        ),
+        PetLibroBinarySensorEntityDescription[Device](
+            key="low_desiccant",
+            translation_key="low_desiccant",
+            icon="mdi:package-variant-remove",
+            device_class=BinarySensorDeviceClass.PROBLEM,
+        ),
+        PetLibroBinarySensorEntityDescription[Device](
+            key="cleaning_due",
+            translation_key="cleaning_due",
+            icon="mdi:spray-bottle",
+            device_class=BinarySensorDeviceClass.PROBLEM,
+        ),
+    )
+}
 
 
 async def async_setup_entry(
@@ -67,11 +124,23 @@ async def async_setup_entry(
 ) -> None:
     """Set up PETLIBRO binary sensors using config entry."""
     hub = entry.runtime_data
-    entities = [
-        PetLibroBinarySensorEntity(device, hub, description)
-        for device in hub.devices
-        for device_type, entity_descriptions in DEVICE_BINARY_SENSOR_MAP.items()
-        if isinstance(device, device_type)
-        for description in entity_descriptions
-    ]
-    async_add_entities(entities)
+
+    def add_entities(devices: list[Device]) -> None:
+        entities: list[PetLibroBinarySensorEntity] = [
+            PetLibroBinarySensorEntity(device, hub, description)
+            for device in devices
+            for description in DEVICE_BINARY_SENSOR_DESCRIPTIONS.get(device)
+        ]
+        entities.extend(
+            PetLibroAlertBinarySensorEntity(device, hub, ALERT_BINARY_SENSORS[rule.key])
+            for device in devices
+            if device.alerts is not None
+            for rule in device.alerts.rules
+            if rule.key in ALERT_BINARY_SENSORS
+        )
+        async_add_entities(entities)
+
+    add_entities(hub.devices)
+    entry.async_on_unload(
+        hub.register_entity_adder(Platform.BINARY_SENSOR, add_entities)
+    )
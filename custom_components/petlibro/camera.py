@@ -0,0 +1,106 @@
+"""Support for PETLIBRO cameras."""
+
+from __future__ import annotations
+
+from contextlib import aclosing
+from dataclasses import dataclass
+from logging import getLogger
+
+from aiohttp import web
+
+from homeassistant.components.camera import Camera, CameraEntityDescription
+from homeassistant.const import Platform
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from . import PetLibroHubConfigEntry
+from .devices import Device
+from .entity import (
+    DescriptionIndex,
+    PetLibroEntity,
+    PetLibroEntityDescription,
+    _DeviceT,
+)
+from .hub import PetLibroHub
+
+_LOGGER = getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class PetLibroCameraEntityDescription(
+    CameraEntityDescription, PetLibroEntityDescription[_DeviceT]
+):
+    """A class that describes device camera entities."""
+
+
+class PetLibroCameraEntity(PetLibroEntity[_DeviceT], Camera):
+    """PETLIBRO camera entity."""
+
+    entity_description: PetLibroCameraEntityDescription[_DeviceT]  # type: ignore [reportIncompatibleVariableOverride]
+
+    def __init__(
+        self,
+        device: _DeviceT,
+        hub: PetLibroHub,
+        description: PetLibroCameraEntityDescription[_DeviceT],
+    ) -> None:
+        """Initialize the PETLIBRO and camera parts of the entity."""
+        super().__init__(device, hub, description)
+        Camera.__init__(self)
+
+    async def async_camera_image(
+        self, width: int | None = None, height: int | None = None
+    ) -> bytes | None:
+        """Return the last frame, shared between all the viewers."""
+        return await self.hub.snapshots.async_get(self.device.serial)
+
+    async def handle_async_mjpeg_stream(
+        self, request: web.Request
+    ) -> web.StreamResponse | None:
+        """Serve the camera as MJPEG from the stream shared by all viewers."""
+        response = web.StreamResponse()
+        response.content_type = "multipart/x-mixed-replace;boundary=frame"
+        await response.prepare(request)
+
+        # Closed right away when the client leaves, releasing the upstream
+        async with aclosing(
+            self.hub.stream_relay(self.device.serial).subscribe()
+        ) as frames:
+            async for frame in frames:
+                await response.write(
+                    b"--frame\r\nContent-Type: image/jpeg\r\n"
+                    b"Content-Length: %d\r\n\r\n" % len(frame)
+                )
+                await response.write(frame)
+                await response.write(b"\r\n")
+        return response
+
+
+DEVICE_CAMERA_MAP: dict[str, list[PetLibroCameraEntityDescription]] = {
+    "GranaryCameraFeeder": [
+        PetLibroCameraEntityDescription["GranaryCameraFeeder"](
+            key="camera",
+            translation_key="camera",
+        ),
+    ],
+}
+DEVICE_CAMERA_DESCRIPTIONS = DescriptionIndex(DEVICE_CAMERA_MAP)
+
+
+async def async_setup_entry(
+    _: HomeAssistant,
+    entry: PetLibroHubConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up PETLIBRO cameras using config entry."""
+    hub = entry.runtime_data
+
+    def add_entities(devices: list[Device]) -> None:
+        async_add_entities(
+            PetLibroCameraEntity(device, hub, description)
+            for device in devices
+            for description in DEVICE_CAMERA_DESCRIPTIONS.get(device)
+        )
+
+    add_entities(hub.devices)
+    entry.async_on_unload(hub.register_entity_adder(Platform.CAMERA, add_entities))
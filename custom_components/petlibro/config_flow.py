@@ -7,21 +7,37 @@ from typing import Any, Mapping
 
 import voluptuous as vol
 
-from homeassistant.config_entries import ConfigFlow, ConfigFlowResult
-from homeassistant.const import CONF_REGION, CONF_EMAIL, CONF_PASSWORD, CONF_API_TOKEN
+from homeassistant.config_entries import (
+    ConfigEntry,
+    ConfigFlow,
+    ConfigFlowResult,
+    OptionsFlow,
+)
+from homeassistant.core import callback
+from homeassistant.const import CONF_REGION, CONF_EMAIL, CONF_PASSWORD, CONF_API_TOKEN, CONF_URL
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
-from .const import DOMAIN
+from .const import (
+    CONF_CLEANING_DAYS,
+    CONF_LOW_DESICCANT_DAYS,
+    CONF_LOW_REMAINING_WATER,
+    CONF_LOW_WATER_LEVEL,
+    CONF_PUSH_TOPIC,
+    DEFAULT_ALERT_THRESHOLDS,
+    DOMAIN,
+)
 from .api import PetLibroAPI
+from .endpoints import parse_endpoints
 from .exceptions import PetLibroCannotConnect, PetLibroInvalidAuth
 
 _LOGGER = logging.getLogger(__name__)
 
 STEP_USER_DATA_SCHEMA = vol.Schema(
     {
-        vol.Required(CONF_REGION): vol.In(["US"]),
+        vol.Required(CONF_REGION): vol.In(list(PetLibroAPI.API_URLS)),
         vol.Required(CONF_EMAIL): str,
-        vol.Required(CONF_PASSWORD): str
+        vol.Required(CONF_PASSWORD): str,
+        vol.Optional(CONF_URL): str
     }
 )
 
@@ -34,6 +50,13 @@ class PetlibroConfigFlow(ConfigFlow, domain=DOMAIN):
     token: str
     email: str
     region: str
+    url: str | None
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> OptionsFlow:
+        """Create the options flow."""
+        return PetlibroOptionsFlow()
 
     async def async_step_user(self, user_input: dict[str, Any] | None = None) -> ConfigFlowResult:
         """Handle the initial step."""
@@ -45,7 +68,8 @@ class PetlibroConfigFlow(ConfigFlow, domain=DOMAIN):
                 return self.async_create_entry(title=user_input[CONF_EMAIL], data={
                     CONF_REGION: user_input[CONF_REGION],
                     CONF_EMAIL: user_input[CONF_EMAIL],
-                    CONF_API_TOKEN: self.token
+                    CONF_API_TOKEN: self.token,
+                    CONF_URL: user_input.get(CONF_URL)
                 })
 
             errors["base"] = error
@@ -58,6 +82,7 @@ class PetlibroConfigFlow(ConfigFlow, domain=DOMAIN):
         """Handle a reauthorization flow request."""
         self.email = entry_data[CONF_EMAIL]
         self.region = entry_data[CONF_REGION]
+        self.url = entry_data.get(CONF_URL)
         return await self.async_step_reauth_confirm()
 
     async def async_step_reauth_confirm(self, user_input: dict[str, str] | None = None) -> ConfigFlowResult:
@@ -66,14 +91,15 @@ class PetlibroConfigFlow(ConfigFlow, domain=DOMAIN):
         if user_input:
             entry_id = self.context["entry_id"]
             if entry := self.hass.config_entries.async_get_entry(entry_id):
-                user_input = user_input | {CONF_EMAIL: self.email, CONF_REGION: self.region}
+                user_input = user_input | {CONF_EMAIL: self.email, CONF_REGION: self.region, CONF_URL: self.url}
                 if not (error := await self._validate_input(user_input)):
                     self.hass.config_entries.async_update_entry(
                         entry,
                         data={
                             CONF_EMAIL: self.email,
                             CONF_REGION: self.region,
-                            CONF_API_TOKEN: self.token
+                            CONF_API_TOKEN: self.token,
+                            CONF_URL: self.url
                             },
                     )
                     await self.hass.config_entries.async_reload(entry.entry_id)
@@ -93,7 +119,8 @@ class PetlibroConfigFlow(ConfigFlow, domain=DOMAIN):
         Data has the keys from STEP_USER_DATA_SCHEMA with values provided by the user.
         """
         try:
-            api = PetLibroAPI(async_get_clientsession(self.hass), self.hass.config.time_zone, data[CONF_REGION])
+            api = PetLibroAPI(async_get_clientsession(self.hass), self.hass.config.time_zone, data[CONF_REGION],
+                              endpoints=parse_endpoints(data.get(CONF_URL)))
             self.token = await api.login(data[CONF_EMAIL], data[CONF_PASSWORD])
         except PetLibroCannotConnect:
             return "cannot_connect"
@@ -103,3 +130,37 @@ class PetlibroConfigFlow(ConfigFlow, domain=DOMAIN):
             _LOGGER.exception("Unexpected exception: %s", e)
             return "unknown"
         return ""
+
+
+class PetlibroOptionsFlow(OptionsFlow):
+    """Handle the alert thresholds and push topic of a Petlibro entry."""
+
+    async def async_step_init(self, user_input: dict[str, Any] | None = None) -> ConfigFlowResult:
+        """Manage the alert thresholds and push topic."""
+        if user_input is not None:
+            return self.async_create_entry(data=user_input)
+
+        options = DEFAULT_ALERT_THRESHOLDS | dict(self.config_entry.options)
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(key, default=options[key]): vol.All(
+                        vol.Coerce(float), vol.Range(min=0)
+                    )
+                    for key in (
+                        CONF_LOW_WATER_LEVEL,
+                        CONF_LOW_REMAINING_WATER,
+                        CONF_LOW_DESICCANT_DAYS,
+                        CONF_CLEANING_DAYS,
+                    )
+                }
+            ).extend(
+                {
+                    vol.Optional(
+                        CONF_PUSH_TOPIC,
+                        description={"suggested_value": options.get(CONF_PUSH_TOPIC)},
+                    ): str,
+                }
+            ),
+        )
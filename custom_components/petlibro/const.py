@@ -1 +1,24 @@
 DOMAIN = "petlibro"
+
+SERVICE_SET_FEEDING_PLAN = "set_feeding_plan"
+SERVICE_SKIP_TODAY = "skip_today"
+SERVICE_EXPORT_HISTORY = "export_history"
+BULK_WRITE_CONCURRENCY = 5
+
+CONF_LOW_WATER_LEVEL = "low_water_level"
+CONF_LOW_REMAINING_WATER = "low_remaining_water"
+CONF_LOW_DESICCANT_DAYS = "low_desiccant_days"
+CONF_CLEANING_DAYS = "cleaning_days"
+DEFAULT_ALERT_THRESHOLDS = {
+    CONF_LOW_WATER_LEVEL: 20,
+    CONF_LOW_REMAINING_WATER: 300,
+    CONF_LOW_DESICCANT_DAYS: 3,
+    CONF_CLEANING_DAYS: 1,
+}
+EVENT_PETLIBRO_ALERT = "petlibro_alert"
+
+# Dispatcher signal sent with each hub once its devices are loaded
+SIGNAL_HUB_LOADED = f"{DOMAIN}_hub_loaded"
+
+# MQTT topic filter of the pushed device state, push is disabled when unset
+CONF_PUSH_TOPIC = "push_topic"
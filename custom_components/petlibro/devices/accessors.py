@@ -0,0 +1,33 @@
+"""Accessors of the raw device data, declared by data path."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Any
+
+
+def compile_path(path: str, default: Any = None) -> Callable[[dict], Any]:
+    """Return a function reading a dotted data path from a dict.
+
+    The path is split once instead of on every read, and single key paths
+    read with a single ``dict.get``.
+    """
+    keys = tuple(path.split("."))
+    if len(keys) == 1:
+        key = keys[0]
+        return lambda data: data.get(key, default)
+
+    def get(data: dict) -> Any:
+        for key in keys:
+            if not isinstance(data, dict):
+                return default
+            data = data.get(key, default)
+        return data
+
+    return get
+
+
+def data_property(path: str, default: Any = None, doc: str | None = None) -> Any:
+    """Declare a read-only device property backed by a raw data path."""
+    getter = compile_path(path, default)
+    return property(lambda self: getter(self._data), doc=doc)  # pylint: disable=protected-access
@@ -0,0 +1,101 @@
+"""Threshold alerts evaluated when the backing device data changes."""
+
+from __future__ import annotations
+
+from asyncio import TimerHandle, get_running_loop
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import partial
+from typing import TYPE_CHECKING
+
+from .event import EVENT_UPDATE
+
+if TYPE_CHECKING:
+    from .device import Device
+
+EVENT_ALERT = "alert"
+
+
+@dataclass(frozen=True)
+class AlertRule:
+    """An alert raised when a device property falls to a threshold.
+
+    The alert clears once the value rises above ``threshold + hysteresis``,
+    so a value hovering around the threshold does not flap. With a
+    ``debounce``, the value must stay at or below the threshold for that
+    many seconds before the alert is raised.
+    """
+
+    key: str
+    property: str
+    data_keys: frozenset[str]
+    threshold: float
+    hysteresis: float = 0.0
+    debounce: float = 0.0
+
+
+class AlertEngine:
+    """Evaluate the alert rules of a device when their data keys change.
+
+    Alert changes are emitted on the device as ``EVENT_ALERT`` with the
+    rule and whether the alert is now active.
+    """
+
+    def __init__(self, device: Device, rules: list[AlertRule]) -> None:
+        """Subscribe the rules that apply to the device."""
+        self.device = device
+        self.rules = [rule for rule in rules if hasattr(type(device), rule.property)]
+        self.active: dict[str, bool] = {rule.key: False for rule in self.rules}
+        self._pending: dict[str, TimerHandle] = {}
+        self._unsubscribes: list[Callable[[], None]] = [
+            device.on(EVENT_UPDATE, partial(self.evaluate, rule), keys=rule.data_keys)
+            for rule in self.rules
+        ]
+        for rule in self.rules:
+            self.evaluate(rule)
+
+    def value(self, rule: AlertRule) -> float | None:
+        """Return the current value of the property of a rule."""
+        try:
+            return float(getattr(self.device, rule.property))
+        except (TypeError, ValueError):
+            return None
+
+    def evaluate(self, rule: AlertRule) -> None:
+        """Raise or clear the alert of a rule from the current value."""
+        if (value := self.value(rule)) is None:
+            return
+        if not self.active[rule.key] and value <= rule.threshold:
+            if rule.key in self._pending:
+                return
+            if rule.debounce > 0:
+                self._pending[rule.key] = get_running_loop().call_later(
+                    rule.debounce, self._debounced, rule
+                )
+            else:
+                self._set(rule, True)
+        elif value > rule.threshold:
+            if (pending := self._pending.pop(rule.key, None)) is not None:
+                pending.cancel()
+            if self.active[rule.key] and value > rule.threshold + rule.hysteresis:
+                self._set(rule, False)
+
+    def _debounced(self, rule: AlertRule) -> None:
+        """Raise the alert if the value is still at or below the threshold."""
+        self._pending.pop(rule.key, None)
+        if (value := self.value(rule)) is not None and value <= rule.threshold:
+            self._set(rule, True)
+
+    def _set(self, rule: AlertRule, active: bool) -> None:
+        """Change the state of an alert and emit it."""
+        self.active[rule.key] = active
+        self.device.emit(EVENT_ALERT, rule, active)
+
+    def close(self) -> None:
+        """Unsubscribe the rules and cancel the pending alerts."""
+        for unsubscribe in self._unsubscribes:
+            unsubscribe()
+        for pending in self._pending.values():
+            pending.cancel()
+        self._unsubscribes.clear()
+        self._pending.clear()
@@ -0,0 +1,98 @@
+"""Declarative catalog of the supported PETLIBRO products.
+
+Adding a model sharing an existing device class only needs a new entry:
+its product name, device class and the API endpoints its state is made of,
+including the ones only fetched when the device needs them.
+
+Fields and entities are not part of the catalog. Fields are declared on the
+device classes with ``data_property``, and entity descriptions stay in the
+platform maps, resolved once per device class, as they are made of Home
+Assistant types and callbacks this package does not depend on. A model with
+new fields or entities still needs them declared there.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from functools import cache
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from ..api import PetLibroAPI
+    from .device import Device
+
+# API method name, the data key of its result (None merges it at the root)
+# and optionally the name of a device method telling, from the data fetched
+# so far in the refresh, whether the step is needed
+FetchStep = tuple[str, str | None] | tuple[str, str | None, str]
+CompiledFetchPlan = tuple[
+    tuple[Callable[[str], Awaitable[Any]], str | None, str | None], ...
+]
+
+BASE_FETCH_PLAN: tuple[FetchStep, ...] = (
+    ("device_base_info", None),
+    ("device_real_info", None),
+)
+
+FEEDER_FETCH_PLAN: tuple[FetchStep, ...] = (
+    *BASE_FETCH_PLAN,
+    ("device_grain_status", "grainStatus"),
+    ("device_feeding_plan_today_new", "feedingPlanTodayNew", "feeding_plan_outdated"),
+)
+
+
+def compile_fetch_plan(
+    plan: tuple[FetchStep, ...], api: PetLibroAPI
+) -> CompiledFetchPlan:
+    """Bind the API methods of a fetch plan once for a device."""
+    return tuple(
+        (getattr(api, method), key, condition[0] if condition else None)
+        for method, key, *condition in plan
+    )
+
+
+@cache
+def _import_class(path: str) -> type[Device]:
+    """Import a class from a "module:class" path relative to this package."""
+    module, name = path.split(":")
+    return getattr(import_module(module, __package__), name)
+
+
+@dataclass(frozen=True)
+class Product:
+    """A supported PETLIBRO product."""
+
+    name: str
+    # "module:class" relative to the devices package, imported when needed
+    device_class: str
+    fetch_plan: tuple[FetchStep, ...] = BASE_FETCH_PLAN
+
+    def load_class(self) -> type[Device]:
+        """Import and return the device class of the product."""
+        return _import_class(self.device_class)
+
+    def create(self, data: dict, api: PetLibroAPI) -> Device:
+        """Create a device of the product with its compiled fetch plan."""
+        device = self.load_class()(data, api)
+        device.fetch_plan = compile_fetch_plan(self.fetch_plan, api)
+        return device
+
+
+CATALOG: tuple[Product, ...] = (
+    Product(
+        name="Granary Feeder",
+        device_class=".feeders.granary_feeder:GranaryFeeder",
+        fetch_plan=FEEDER_FETCH_PLAN,
+    ),
+    Product(
+        name="Granary Camera Feeder",
+        device_class=".feeders.granary_camera_feeder:GranaryCameraFeeder",
+        fetch_plan=FEEDER_FETCH_PLAN,
+    ),
+    Product(
+        name="Dockstream Smart Fountain",
+        device_class=".fountains.dockstream_smart_fountain:DockstreamSmartFountain",
+    ),
+)
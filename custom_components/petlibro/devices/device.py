@@ -1,19 +1,31 @@
 """Module containing the Device class for interacting with PetLibro devices."""
 
+from datetime import datetime
 from logging import getLogger
-from typing import cast
-
+from homeassistant.const import Platform
 from homeassistant.helpers.device_registry import format_mac
+from homeassistant.util import dt as dt_util
 
 from ..api import PetLibroAPI
-from .event import EVENT_UPDATE, Event
+from .accessors import data_property
+from .alerts import AlertEngine, AlertRule
+from .catalog import BASE_FETCH_PLAN, CompiledFetchPlan, compile_fetch_plan
+from .event import EVENT_DIFF, EVENT_UPDATE, Event
 
 _LOGGER = getLogger(__name__)
+_MISSING = object()
 
 
 class Device(Event):
     """Class representing a PetLibro device."""
 
+    # Platforms of the device, merged with the ones of its base classes
+    platforms: tuple[Platform, ...] = ()
+
+    # Work record types kept in the local history, and their quantity field
+    history_record_types: tuple[str, ...] = ()
+    history_value_key: str | None = None
+
     def __init__(self, data: dict, api: PetLibroAPI) -> None:
         """Initialize the Device with data and API.
 
@@ -23,53 +35,105 @@ class Device(Event):
         super().__init__()
         self._data: dict = {}
         self.api = api
+        self.fetch_plan: CompiledFetchPlan = compile_fetch_plan(BASE_FETCH_PLAN, api)
+        self.alerts: AlertEngine | None = None
+        self.last_refreshed: datetime | None = None
         _LOGGER.debug("Creating device: %s", data)
 
         self.update_data(data)
 
     def update_data(self, data: dict) -> None:
-        """Save the device info from a data dictionary."""
+        """Save the device info from a data dictionary.
+
+        Listeners are only notified of the keys whose value changed. The old
+        and new values are only collected when someone listens to the diffs.
+        """
+        changed = {
+            key for key, value in data.items() if self._data.get(key, _MISSING) != value
+        }
+        diff = (
+            {key: (self._data.get(key), data[key]) for key in changed}
+            if changed and self._listeners.get(EVENT_DIFF)
+            else None
+        )
         self._data.update(data)
-        self.emit(EVENT_UPDATE)
+        if changed:
+            self.emit(EVENT_UPDATE, keys=changed)
+        if diff:
+            self.emit(EVENT_DIFF, diff, keys=changed)
+
+    def configure_alerts(self, rules: list[AlertRule]) -> None:
+        """Evaluate the alert rules that apply to the device."""
+        if self.alerts is not None:
+            self.alerts.close()
+        self.alerts = AlertEngine(self, rules)
+
+    def close(self) -> None:
+        """Stop the alerts and detach every listener of the device."""
+        if self.alerts is not None:
+            self.alerts.close()
+            self.alerts = None
+        self._listeners.clear()
 
     async def refresh(self):
-        """Refresh the device data from the API."""
+        """Refresh the device data from the endpoints of its fetch plan."""
         data = {}
-        data.update(await self.api.device_base_info(self.serial))
-        data.update(await self.api.device_real_info(self.serial))
+        for fetch, key, condition in self.fetch_plan:
+            if condition is not None and not getattr(self, condition)(data):
+                continue
+            result = await fetch(self.serial)
+            if key is None:
+                data.update(result)
+            else:
+                data[key] = result
+        self.last_refreshed = dt_util.utcnow()
         self.update_data(data)
 
-    @property
-    def serial(self) -> str:
-        """Return the serial number of the device."""
-        return cast(str, self._data.get("deviceSn"))
+    def history_value(self, record: dict) -> float:
+        """Return the quantity of a work record in the history unit."""
+        return float(record.get(self.history_value_key or "") or 0)
 
     @property
-    def model(self) -> str:
-        """Return the model identifier of the device."""
-        return cast(str, self._data.get("productIdentifier"))
+    def history_unit(self) -> str | None:
+        """Return the unit of the work record quantities."""
+        return None
 
-    @property
-    def model_name(self) -> str:
-        """Return the model name of the device."""
-        return cast(str, self._data.get("productName"))
+    @classmethod
+    def is_type(cls, type_name: str) -> bool:
+        """Return whether the device is of a type, given by class name.
 
-    @property
-    def name(self) -> str:
-        """Return the name of the device."""
-        return cast(str, self._data.get("name"))
+        This avoids importing a model module only to check a device type.
+        """
+        return any(base.__name__ == type_name for base in cls.__mro__)
 
     @property
-    def mac(self) -> str:
-        """Return the MAC address of the device."""
-        return cast(str, format_mac(self._data.get("mac")))
+    def refresh_priority(self) -> float:
+        """Return how urgent a refresh of the device is, from 0 to 1."""
+        return 0.0
+
+    async def snapshot_url(self) -> str | None:
+        """Return the URL of the last camera frame, if the device has one."""
+        return None
 
     @property
-    def software_version(self) -> str:
-        """Return the software version of the device."""
-        return cast(str, self._data.get("softwareVersion"))
+    def online(self) -> bool:
+        """Return whether the device is connected to the cloud."""
+        return self._data.get("online", True) is not False
+
+    serial: str = data_property("deviceSn", doc="The serial number of the device.")
+    model: str = data_property(
+        "productIdentifier", doc="The model identifier of the device."
+    )
+    model_name: str = data_property("productName", doc="The model name of the device.")
+    name: str = data_property("name", doc="The name of the device.")
+    software_version: str = data_property(
+        "softwareVersion", doc="The software version of the device."
+    )
+    hardware_version: str = data_property(
+        "hardwareVersion", doc="The hardware version of the device."
+    )
 
     @property
-    def hardware_version(self) -> str:
-        """Return the hardware version of the device."""
-        return cast(str, self._data.get("hardwareVersion"))
+    def mac(self) -> str:
+        """Return the MAC address of the device."""
+        return format_mac(self._data.get("mac"))
@@ -0,0 +1,87 @@
+"""Between-poll estimation of slowly changing PETLIBRO device values."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from time import monotonic
+
+
+@dataclass(frozen=True)
+class Estimate:
+    """An extrapolated value and how much it can be trusted (0 to 1)."""
+
+    value: float
+    confidence: float
+
+
+class RateEstimator:
+    """Learn the change rate of a value from snapshots and extrapolate it.
+
+    The rate is an exponential moving average of the slope between
+    successive snapshots. A snapshot moving against ``direction`` (a refill,
+    a day rollover...) keeps the new value but restarts the rate learning.
+    """
+
+    def __init__(
+        self,
+        direction: int,
+        horizon: float,
+        smoothing: float = 0.3,
+        minimum: float | None = 0,
+        maximum: float | None = None,
+    ) -> None:
+        """Initialize the estimator.
+
+        :param direction: -1 for a decreasing value, 1 for an increasing one.
+        :param horizon: Seconds after a snapshot at which confidence reaches 0.
+        :param smoothing: Weight of the newest slope in the moving average.
+        :param minimum: Lower bound of the extrapolated value.
+        :param maximum: Upper bound of the extrapolated value.
+        """
+        self.direction = direction
+        self.horizon = horizon
+        self.smoothing = smoothing
+        self.minimum = minimum
+        self.maximum = maximum
+        self.rate: float | None = None
+        self.samples = 0
+        self._value: float | None = None
+        self._at = 0.0
+
+    def observe(self, value: float | None, at: float | None = None) -> None:
+        """Record a snapshot of the value."""
+        if value is None:
+            return
+        at = monotonic() if at is None else at
+
+        if self._value is not None and at > self._at:
+            slope = (value - self._value) / (at - self._at)
+            if slope * self.direction < 0:
+                self.rate = None
+                self.samples = 0
+            elif self.rate is None:
+                self.rate = slope
+                self.samples = 1
+            else:
+                self.rate += self.smoothing * (slope - self.rate)
+                self.samples += 1
+
+        self._value = value
+        self._at = at
+
+    def estimate(self, at: float | None = None) -> Estimate | None:
+        """Return the extrapolated value at a given time."""
+        if self._value is None:
+            return None
+        if self.rate is None:
+            return Estimate(self._value, 0.0)
+
+        elapsed = max((monotonic() if at is None else at) - self._at, 0.0)
+        value = self._value + self.rate * elapsed
+        if self.minimum is not None:
+            value = max(value, self.minimum)
+        if self.maximum is not None:
+            value = min(value, self.maximum)
+
+        confidence = max(1 - elapsed / self.horizon, 0.0) * min(self.samples / 3, 1)
+        return Estimate(value, round(confidence, 2))
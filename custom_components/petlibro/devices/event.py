@@ -2,37 +2,106 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable
-from dataclasses import dataclass, field
-from typing import Any
+from collections.abc import Callable, Iterable
+from inspect import ismethod
+from itertools import count
+from logging import getLogger
+from time import perf_counter
+from typing import Any, TypeAlias
+from weakref import WeakMethod
 
 EVENT_UPDATE = "update"
+# Emitted with a ``{key: (old, new)}`` dict of the changed data
+EVENT_DIFF = "diff"
+SLOW_LISTENER_SECONDS = 0.05
+
+_LOGGER = getLogger(__name__)
+
+_Listener: TypeAlias = tuple[Callable[[], Callable | None], frozenset[str] | None]
+
+
+def _reference(callback: Callable) -> Callable[[], Callable | None]:
+    """Reference a callback, weakly if it is a bound method."""
+    if ismethod(callback):
+        return WeakMethod(callback)
+    return lambda: callback
 
 
-@dataclass
 class Event:
-    """Abstract event class properties and methods."""
+    """Abstract event class properties and methods.
+
+    Listeners are stored by subscription token, so subscribing and
+    unsubscribing are O(1). Bound methods are only weakly referenced: a
+    listener whose object was garbage collected is dropped on the next
+    emit. Listener errors and slow listeners are counted and logged.
+    """
 
-    _listeners: dict[str, list[Callable]] = field(default_factory=dict)
+    def __init__(self) -> None:
+        """Initialize the listeners."""
+        self._listeners: dict[str, dict[int, _Listener]] = {}
+        self._tokens = count()
+        self.listener_errors = 0
+        self.slow_listeners = 0
 
-    def emit(self, event_name: str, *args: Any, **kwargs: Any) -> None:
-        """Run all callbacks for an event."""
-        for listener in self._listeners.get(event_name, []):
+    def emit(
+        self,
+        event_name: str,
+        *args: Any,
+        keys: Iterable[str] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Run all callbacks for an event.
+
+        :param keys: The data keys concerned by the event, only listeners
+            subscribed to one of them (or to every key) are called.
+        """
+        if not (listeners := self._listeners.get(event_name)):
+            return
+        if keys is not None and not isinstance(keys, (set, frozenset)):
+            keys = set(keys)
+
+        dead = []
+        for token, (reference, topics) in tuple(listeners.items()):
+            if topics is not None and keys is not None and topics.isdisjoint(keys):
+                continue
+            if (listener := reference()) is None:
+                dead.append(token)
+                continue
+
+            start = perf_counter()
             try:
                 listener(*args, **kwargs)
-            except:  # pragma: no cover # pylint: disable=bare-except # noqa: E722
-                pass
+            except Exception:  # pylint: disable=broad-except
+                self.listener_errors += 1
+                _LOGGER.exception("Error in %s listener %s", event_name, listener)
+            if (elapsed := perf_counter() - start) > SLOW_LISTENER_SECONDS:
+                self.slow_listeners += 1
+                _LOGGER.debug(
+                    "Slow %s listener %s took %.3fs", event_name, listener, elapsed
+                )
+
+        for token in dead:
+            listeners.pop(token, None)
 
     def on(  # pylint: disable=invalid-name
-        self, event_name: str, callback: Callable
+        self,
+        event_name: str,
+        callback: Callable,
+        keys: Iterable[str] | None = None,
     ) -> Callable:
-        """Register an event callback."""
-        listeners: list = self._listeners.setdefault(event_name, [])
-        listeners.append(callback)
+        """Register an event callback.
+
+        :param keys: Only call the callback for events concerning these keys.
+        """
+        listeners = self._listeners.setdefault(event_name, {})
+        token = next(self._tokens)
+        listeners[token] = (
+            _reference(callback),
+            frozenset(keys) if keys is not None else None,
+        )
 
         def unsubscribe() -> None:
             """Unsubscribe listeners."""
-            if callback in listeners:
-                listeners.remove(callback)
+            listeners.pop(token, None)
 
         return unsubscribe
@@ -1,6 +1,14 @@
 """Generic PETLIBRO feeder"""
+from datetime import datetime, timedelta
 from typing import Optional, cast
+
+from homeassistant.const import Platform
+from homeassistant.util import dt as dt_util
+
+from ...api import PetLibroAPI
+from ..accessors import data_property
 from . import Device
+from .schedule import FeedingSchedule
 
 
 UNITS = {
@@ -17,19 +25,43 @@ UNITS_RATIO = {
     4: 20
 }
 
+PLAN_MAX_AGE = timedelta(hours=1)
+# A feeder with a meal due within this delay is refreshed first
+FEED_DUE_SOON = timedelta(minutes=15)
+
 class Feeder(Device):
     """Generic PETLIBRO feeder device"""
 
-    async def refresh(self):
-        await super().refresh()
-        self.update_data({
-            "feedingPlanTodayNew": await self.api.device_feeding_plan_today_new(self.serial)
-        })
+    platforms = (Platform.SWITCH, Platform.SENSOR)
 
-    @property
-    def unit_id(self) -> int | None:
-        """The device unit type identifier"""
-        return self._data.get("unitType")
+    history_record_types = ("GRAIN_OUTPUT_SUCCESS",)
+    history_value_key = "actualGrainNum"
+
+    def __init__(self, data: dict, api: PetLibroAPI) -> None:
+        self._schedule: FeedingSchedule | None = None
+        self._plan_fetched_at: datetime | None = None
+        self._plan_enabled: bool | None = None
+        super().__init__(data, api)
+
+    def update_data(self, data: dict) -> None:
+        if "feedingPlanTodayNew" in data:
+            self._schedule = None
+            # The plan stays fresh for the plan state it was fetched with
+            self._plan_fetched_at = dt_util.now()
+            self._plan_enabled = data.get("enableFeedingPlan", self.feeding_plan)
+        super().update_data(data)
+
+    def feeding_plan_outdated(self, data: dict) -> bool:
+        """Whether today's feeding plan must be fetched, given the fetched data"""
+        now = dt_util.now()
+        return (
+            self._plan_fetched_at is None
+            or self._plan_fetched_at.date() != now.date()
+            or now - self._plan_fetched_at >= PLAN_MAX_AGE
+            or self._plan_enabled != data.get("enableFeedingPlan", self.feeding_plan)
+        )
+
+    unit_id: int | None = data_property("unitType", doc="The device unit type identifier")
 
     @property
     def unit_type(self) -> str | None:
@@ -41,21 +73,78 @@ class Feeder(Device):
 
         return unit
 
-    @property
-    def feeding_plan(self) -> bool:
-        return self._data.get("enableFeedingPlan", False)
+    feeding_plan: bool = data_property("enableFeedingPlan", False)
 
-    async def set_feeding_plan(self, value: bool):
+    async def set_feeding_plan(self, value: bool, refresh: bool = True):
         await self.api.set_device_feeding_plan(self.serial, value)
-        await self.refresh()
+        self._plan_fetched_at = None
+        if refresh:
+            await self.refresh()
+        else:
+            self.update_data({"enableFeedingPlan": value})
 
     @property
     def feeding_plan_today_all(self) -> bool:
         return not cast(bool, self._data.get("feedingPlanTodayNew", {}).get("allSkipped"))
 
-    async def set_feeding_plan_today_all(self, value: bool):
+    async def set_feeding_plan_today_all(self, value: bool, refresh: bool = True):
         await self.api.set_device_feeding_plan_today_all(self.serial, value)
-        await self.refresh()
+        self._plan_fetched_at = None
+        if refresh:
+            await self.refresh()
+        else:
+            self.update_data({
+                "feedingPlanTodayNew": {
+                    **self._data.get("feedingPlanTodayNew", {}),
+                    "allSkipped": not value
+                }
+            })
+            # Only a local guess, the next refresh fetches the real plan
+            self._plan_fetched_at = None
+
+    @property
+    def schedule(self) -> FeedingSchedule:
+        """Today's feeding timeline, parsed once per plan and per day"""
+        now = dt_util.now()
+        if self._schedule is None or self._schedule.day != now.date():
+            self._schedule = FeedingSchedule(
+                self._data.get("feedingPlanTodayNew", {}), now.date(), now.tzinfo
+            )
+        return self._schedule
+
+    @property
+    def refresh_priority(self) -> float:
+        """Refresh feeders about to serve a meal first"""
+        next_time = self.next_feeding_time
+        if next_time is not None and next_time - dt_util.now() <= FEED_DUE_SOON:
+            return 1.0
+        return 0.0
+
+    @property
+    def next_feeding_time(self) -> datetime | None:
+        """The time of the next meal today"""
+        if meal := self.schedule.next_meal(dt_util.now()):
+            return meal.at
+        return None
+
+    @property
+    def next_feeding_portion(self) -> int | None:
+        """The quantity of the next meal today"""
+        if meal := self.schedule.next_meal(dt_util.now()):
+            return self.convert_unit(meal.portions)
+        return None
+
+    @property
+    def remaining_meals_today(self) -> int:
+        """The number of meals still to come today"""
+        return self.schedule.remaining_meals(dt_util.now())
+
+    def history_value(self, record: dict) -> float:
+        return self.convert_unit(super().history_value(record))
+
+    @property
+    def history_unit(self) -> str | None:
+        return self.unit_type
 
     def convert_unit(self, value: int) -> int:
         """
@@ -1,4 +1,11 @@
+from homeassistant.const import Platform
+
 from .granary_feeder import GranaryFeeder
 
+
 class GranaryCameraFeeder(GranaryFeeder):
-  pass
+    platforms = (Platform.CAMERA,)
+
+    async def snapshot_url(self) -> str | None:
+        """URL of the last camera frame"""
+        return await self.api.device_last_picture(self.serial)
@@ -1,18 +1,14 @@
-from typing import cast
+from homeassistant.const import Platform
 
+from ..accessors import data_property
 from .feeder import Feeder
 
 
 class GranaryFeeder(Feeder):
-    async def refresh(self):
-        await super().refresh()
-        self.update_data({
-            "grainStatus": await self.api.device_grain_status(self.serial)
-        })
+    platforms = (Platform.SENSOR, Platform.BINARY_SENSOR)
 
-    @property
-    def remaining_desiccant(self) -> str:
-        return cast(str, self._data.get("remainingDesiccantDays"))
+    remaining_desiccant: str = data_property("remainingDesiccantDays")
+    today_feeding_times: int = data_property("grainStatus.todayFeedingTimes")
 
     @property
     def today_feeding_quantity(self) -> int:
@@ -21,7 +17,3 @@ class GranaryFeeder(Feeder):
             return 0
 
         return self.convert_unit(quantity)
-
-    @property
-    def today_feeding_times(self) -> int:
-        return cast(int, self._data.get("grainStatus", {}).get("todayFeedingTimes"))
@@ -0,0 +1,62 @@
+"""Local timeline of a PETLIBRO feeder's meals for the day."""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from dataclasses import dataclass
+from datetime import date, datetime, time, tzinfo
+
+
+@dataclass(frozen=True)
+class Meal:
+    """A meal planned for today."""
+
+    at: datetime
+    portions: int
+    skipped: bool
+
+
+class FeedingSchedule:
+    """Today's feeding plan parsed once into a sorted timeline.
+
+    Meals are marked as done locally once their time has passed, so the
+    next meal and the remaining meals are computed without asking the API.
+    """
+
+    def __init__(self, plan: dict, day: date, time_zone: tzinfo) -> None:
+        """Parse the ``feedingPlanTodayNew`` payload for a given day."""
+        self.day = day
+        all_skipped = bool(plan.get("allSkipped"))
+        meals = []
+
+        for item in plan.get("plans") or []:
+            try:
+                hour, minute = str(item["executionTime"]).split(":")[:2]
+                at = datetime.combine(day, time(int(hour), int(minute)), time_zone)
+            except (KeyError, ValueError):
+                continue
+            meals.append(
+                Meal(
+                    at=at,
+                    portions=int(item.get("grainNum") or 0),
+                    skipped=all_skipped or bool(item.get("skip")),
+                )
+            )
+
+        self.meals = sorted(
+            (meal for meal in meals if not meal.skipped), key=lambda meal: meal.at
+        )
+        self._times = [meal.at for meal in self.meals]
+
+    def _next_index(self, now: datetime) -> int:
+        """Return the index of the first meal after now."""
+        return bisect_right(self._times, now)
+
+    def next_meal(self, now: datetime) -> Meal | None:
+        """Return the next meal still to come today."""
+        index = self._next_index(now)
+        return self.meals[index] if index < len(self.meals) else None
+
+    def remaining_meals(self, now: datetime) -> int:
+        """Return the number of meals still to come today."""
+        return len(self.meals) - self._next_index(now)
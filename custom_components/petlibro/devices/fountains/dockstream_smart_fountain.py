@@ -1,37 +1,89 @@
 """Module containing the DockstreamSmartFountain class, which represents the Dockstream Smart Fountain device."""
 
+from homeassistant.const import Platform
+
+from ...api import PetLibroAPI
+from ..accessors import data_property
+from ..estimator import Estimate, RateEstimator
 from .fountain import Fountain
 
+ESTIMATE_HORIZON_SECONDS = 60 * 15
+# A fountain under this water level is refreshed first
+LOW_WATER_LEVEL = 20
+
 
 class DockstreamSmartFountain(Fountain):
     """A class representing the Dockstream Smart Fountain device."""
 
-    @property
-    def days_before_cleaning(self) -> int | None:
-        """Number of days before fontain needs cleaning."""
-        return self._data.get("remainingCleaningDays")
+    platforms = (Platform.SENSOR, Platform.BINARY_SENSOR)
 
-    @property
-    def days_before_filter_replacement(self) -> int | None:
-        """Number of days before filter needs to be replaced."""
-        return self._data.get("remainingReplacementDays")
+    def __init__(self, data: dict, api: PetLibroAPI) -> None:
+        """Initialize the fountain and its between-poll estimators."""
+        self.estimators = {
+            "weight": RateEstimator(-1, ESTIMATE_HORIZON_SECONDS),
+            "weightPercent": RateEstimator(
+                -1, ESTIMATE_HORIZON_SECONDS, maximum=100
+            ),
+            "todayTotalMl": RateEstimator(1, ESTIMATE_HORIZON_SECONDS),
+        }
+        super().__init__(data, api)
+
+    def update_data(self, data: dict) -> None:
+        """Save the device info and feed the estimators."""
+        for key, estimator in self.estimators.items():
+            if key in data:
+                estimator.observe(data[key])
+        super().update_data(data)
+
+    def estimate(self, key: str) -> Estimate | None:
+        """Return the between-poll estimate of a raw data key."""
+        return self.estimators[key].estimate()
 
     @property
-    def today_water_consumption(self) -> int | None:
-        """Total water consumed today in mL."""
-        return self._data.get("todayTotalMl")
+    def refresh_priority(self) -> float:
+        """Refresh fountains running out of water first."""
+        if (level := self.water_level) is not None and level <= LOW_WATER_LEVEL:
+            return 1.0
+        return 0.0
+
+    days_before_cleaning: int | None = data_property(
+        "remainingCleaningDays", doc="Number of days before fontain needs cleaning."
+    )
+    days_before_filter_replacement: int | None = data_property(
+        "remainingReplacementDays",
+        doc="Number of days before filter needs to be replaced.",
+    )
+    today_water_consumption: int | None = data_property(
+        "todayTotalMl", doc="Total water consumed today in mL."
+    )
+    # Assuming 1g of water is 1mL
+    remaining_water: int | None = data_property(
+        "weight", doc="Remaining water in the fountain in mL."
+    )
+    water_level: int | None = data_property(
+        "weightPercent", doc="Water level percentage in the fountain."
+    )
 
     @property
-    def remaining_water(self) -> int | None:
-        """Remaining water in the fountain in mL."""
+    def estimated_remaining_water(self) -> float | None:
+        """Estimated remaining water in the fountain in mL."""
+        if estimate := self.estimate("weight"):
+            return round(estimate.value)
+        return None
 
-        # Assuming 1g of water is 1mL
-        return self._data.get("weight")
+    @property
+    def estimated_water_level(self) -> float | None:
+        """Estimated water level percentage in the fountain."""
+        if estimate := self.estimate("weightPercent"):
+            return round(estimate.value)
+        return None
 
     @property
-    def water_level(self) -> int | None:
-        """Water level percentage in the fountain."""
-        return self._data.get("weightPercent")
+    def estimated_today_water_consumption(self) -> float | None:
+        """Estimated total water consumed today in mL."""
+        if estimate := self.estimate("todayTotalMl"):
+            return round(estimate.value)
+        return None
 
     @property
     def filter_replacement_required(self) -> bool:
@@ -1,5 +1,12 @@
+from homeassistant.const import UnitOfVolume
+
 from . import Device
 
 
 class Fountain(Device):
-    pass
+    history_record_types = ("DRINK_WATER",)
+    history_value_key = "drinkWaterMl"
+
+    @property
+    def history_unit(self) -> str | None:
+        return UnitOfVolume.MILLILITERS
@@ -0,0 +1,97 @@
+"""Selection of the fastest healthy PETLIBRO API endpoint."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from logging import getLogger
+
+_LOGGER = getLogger(__name__)
+
+# Weight of the newest latency sample in the moving average
+LATENCY_SMOOTHING = 0.3
+# Consecutive failures after which an endpoint is considered down
+FAILURE_THRESHOLD = 3
+
+
+@dataclass
+class EndpointStats:
+    """Health of an API endpoint."""
+
+    url: str
+    latency: float | None = None
+    failures: int = 0
+
+    @property
+    def healthy(self) -> bool:
+        """Return whether the endpoint is usable."""
+        return self.failures < FAILURE_THRESHOLD
+
+
+def parse_endpoints(value: str | None) -> list[str] | None:
+    """Parse a comma separated list of endpoints, None if empty."""
+    return [url.strip() for url in (value or "").split(",") if url.strip()] or None
+
+
+class EndpointSelector:
+    """Route requests to the fastest healthy endpoint, failing over on errors.
+
+    The first endpoint is used until latencies are known. Every request
+    reports its outcome, and probes can be run to measure all the candidates.
+    """
+
+    def __init__(self, urls: list[str]) -> None:
+        """Initialize the selector with candidate base URLs."""
+        if not urls:
+            raise ValueError("At least one endpoint is required")
+        self.stats = {url: EndpointStats(url) for url in urls}
+        self.current = urls[0]
+
+    @property
+    def candidates(self) -> list[str]:
+        """Return every candidate endpoint."""
+        return list(self.stats)
+
+    @property
+    def available(self) -> bool:
+        """Return whether any endpoint is considered up."""
+        return any(stats.healthy for stats in self.stats.values())
+
+    def report_success(self, url: str, latency: float) -> None:
+        """Record a successful request and its latency."""
+        if (stats := self.stats.get(url)) is None:
+            return
+        stats.failures = 0
+        if stats.latency is None:
+            stats.latency = latency
+        else:
+            stats.latency += LATENCY_SMOOTHING * (latency - stats.latency)
+
+    def report_failure(self, url: str) -> None:
+        """Record a failed request, switching endpoint once it is down."""
+        if (stats := self.stats.get(url)) is None:
+            return
+        stats.failures += 1
+        if url == self.current and not stats.healthy:
+            self.select()
+
+    def mark_down(self, url: str) -> None:
+        """Consider an endpoint down until it succeeds again."""
+        if (stats := self.stats.get(url)) is not None:
+            stats.failures = max(stats.failures, FAILURE_THRESHOLD)
+
+    def select(self) -> str:
+        """Switch to the fastest healthy endpoint and return it."""
+        healthy = [stats for stats in self.stats.values() if stats.healthy]
+        if not healthy:
+            # Everything is down: keep trying the endpoints in turn
+            urls = self.candidates
+            best = urls[(urls.index(self.current) + 1) % len(urls)]
+        else:
+            best = min(
+                healthy,
+                key=lambda stats: float("inf") if stats.latency is None else stats.latency,
+            ).url
+        if best != self.current:
+            _LOGGER.info("Switching PETLIBRO API endpoint to %s", best)
+            self.current = best
+        return best
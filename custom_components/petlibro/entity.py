@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterable, Mapping
 from functools import cached_property
-from typing import Generic, TypeVar
+from operator import attrgetter
+from typing import Any, Generic, TypeVar
 
 from homeassistant.helpers.device_registry import CONNECTION_NETWORK_MAC, DeviceInfo
 from homeassistant.helpers.entity import EntityDescription
@@ -18,6 +20,7 @@ from .devices.event import EVENT_UPDATE
 from .hub import PetLibroHub
 
 _DeviceT = TypeVar("_DeviceT", bound=Device)
+_DescriptionT = TypeVar("_DescriptionT")
 
 
 class PetLibroEntity(CoordinatorEntity[DataUpdateCoordinator[bool]], Generic[_DeviceT]):
@@ -37,6 +40,12 @@ class PetLibroEntity(CoordinatorEntity[DataUpdateCoordinator[bool]], Generic[_De
         self.hub = hub
         self.entity_description = description
         self._attr_unique_id = f"{self.device.serial}-{description.key}"
+        self._get_value = attrgetter(description.key)
+
+    @property
+    def value(self) -> Any:
+        """Return the device value described by the entity key."""
+        return self._get_value(self.device)
 
     @cached_property
     def device_info(self) -> DeviceInfo | None:
@@ -52,6 +61,11 @@ class PetLibroEntity(CoordinatorEntity[DataUpdateCoordinator[bool]], Generic[_De
             connections={(CONNECTION_NETWORK_MAC, self.device.mac)},
         )
 
+    @property
+    def available(self) -> bool:
+        """Return if the device is online and its data up to date."""
+        return super().available and self.device.online
+
     async def async_added_to_hass(self) -> None:
         """Set up a listener for the entity."""
         await super().async_added_to_hass()
@@ -60,3 +74,32 @@ class PetLibroEntity(CoordinatorEntity[DataUpdateCoordinator[bool]], Generic[_De
 
 class PetLibroEntityDescription(EntityDescription, Generic[_DeviceT]):
     """PETLIBRO Entity description."""
+
+
+class DescriptionIndex(Generic[_DescriptionT]):
+    """Entity descriptions by device class, resolved once per class.
+
+    The descriptions of a class are the ones registered for every class of
+    its MRO, so a device only needs a dictionary lookup instead of an
+    ``isinstance`` check against every registered type. Classes are
+    registered by name, so the platforms do not import the model modules.
+    """
+
+    def __init__(self, by_type: Mapping[str, Iterable[_DescriptionT]]) -> None:
+        """Initialize the index from a description map."""
+        self._by_type = {
+            device_type: tuple(descriptions)
+            for device_type, descriptions in by_type.items()
+        }
+        self._resolved: dict[type[Device], tuple[_DescriptionT, ...]] = {}
+
+    def get(self, device: Device) -> tuple[_DescriptionT, ...]:
+        """Return the descriptions of a device."""
+        device_type = type(device)
+        if (descriptions := self._resolved.get(device_type)) is None:
+            descriptions = self._resolved[device_type] = tuple(
+                description
+                for base in reversed(device_type.__mro__)
+                for description in self._by_type.get(base.__name__, ())
+            )
+        return descriptions
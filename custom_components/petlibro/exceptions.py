@@ -9,5 +9,9 @@ class PetLibroCannotConnect(PetLibroAPIError):
     """Error to indicate we cannot connect."""
 
 
+class PetLibroServerError(PetLibroCannotConnect):
+    """Error to indicate the API failed to serve a request (5xx)."""
+
+
 class PetLibroInvalidAuth(PetLibroAPIError):
     """Error to indicate there is invalid auth."""
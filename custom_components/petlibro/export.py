@@ -0,0 +1,130 @@
+"""Streaming export of a PETLIBRO device history.
+
+This module only depends on the standard library so it can also be used
+from the command line on a copy of the history files::
+
+    python export.py .storage/petlibro_history/SERIAL.ndjson -f csv -z -o out.csv.gz
+"""
+
+from __future__ import annotations
+
+from argparse import ArgumentParser
+from collections.abc import Iterable, Iterator
+import csv
+from datetime import datetime
+import gzip
+from io import StringIO
+import json
+from pathlib import Path
+import sys
+from typing import IO, Any
+
+EXPORT_FORMATS = ("ndjson", "csv")
+CHUNK_RECORDS = 500
+CSV_FIELDS = ("time", "type", "value")
+
+
+def iter_records(
+    path: Path, start: int | None = None, end: int | None = None
+) -> Iterator[dict[str, Any]]:
+    """Yield the records of a history file within a time range (ms).
+
+    The file is append-only and sorted by time, so reading stops at the
+    first record after the range end.
+    """
+    if not path.exists():
+        return
+    with path.open(encoding="utf-8") as file:
+        for line in file:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if start is not None and record["time"] < start:
+                continue
+            if end is not None and record["time"] > end:
+                break
+            yield record
+
+
+def iter_chunks(
+    records: Iterable[dict[str, Any]],
+    export_format: str,
+    snapshot: dict[str, Any] | None = None,
+) -> Iterator[str]:
+    """Yield the export as text chunks of at most CHUNK_RECORDS records.
+
+    The device snapshot is the first NDJSON line; CSV only holds records.
+    """
+    buffer = StringIO()
+    count = 0
+
+    if export_format == "csv":
+        writer = csv.writer(buffer)
+        writer.writerow(CSV_FIELDS)
+        write = lambda record: writer.writerow(  # noqa: E731
+            [record.get(field) for field in CSV_FIELDS]
+        )
+    else:
+        if snapshot is not None:
+            buffer.write(json.dumps({"snapshot": snapshot}, default=str) + "\n")
+        write = lambda record: buffer.write(  # noqa: E731
+            json.dumps(record, separators=(",", ":")) + "\n"
+        )
+
+    for record in records:
+        write(record)
+        count += 1
+        if count >= CHUNK_RECORDS:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            count = 0
+
+    if chunk := buffer.getvalue():
+        yield chunk
+
+
+def write_chunks(chunks: Iterable[str], output: Path | IO[str], compress: bool) -> None:
+    """Write chunks to a path or a text stream, optionally gzip compressed."""
+    if not isinstance(output, Path):
+        if compress:
+            with gzip.open(output.buffer, "wt", encoding="utf-8") as file:  # type: ignore[attr-defined]
+                file.writelines(chunks)
+        else:
+            output.writelines(chunks)
+        return
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    if compress:
+        with gzip.open(output, "wt", encoding="utf-8") as file:
+            file.writelines(chunks)
+    else:
+        with output.open("w", encoding="utf-8") as file:
+            file.writelines(chunks)
+
+
+def _timestamp(value: str) -> int:
+    """Parse an ISO date or datetime to milliseconds."""
+    return int(datetime.fromisoformat(value).timestamp() * 1000)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Export a history file from the command line."""
+    parser = ArgumentParser(description="Export a PETLIBRO device history")
+    parser.add_argument("history", type=Path, help="device history NDJSON file")
+    parser.add_argument("-f", "--format", choices=EXPORT_FORMATS, default="ndjson")
+    parser.add_argument("-s", "--start", type=_timestamp, help="ISO start time")
+    parser.add_argument("-e", "--end", type=_timestamp, help="ISO end time")
+    parser.add_argument("-z", "--gzip", action="store_true", help="gzip output")
+    parser.add_argument("-o", "--output", type=Path, help="output file (stdout)")
+    args = parser.parse_args(argv)
+
+    write_chunks(
+        iter_chunks(iter_records(args.history, args.start, args.end), args.format),
+        args.output or sys.stdout,
+        args.gzip,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,319 @@
+"""Incremental feeding and drinking history of PETLIBRO devices."""
+
+from __future__ import annotations
+
+from asyncio import gather
+from collections.abc import Iterable, Iterator
+from datetime import UTC, datetime, timedelta
+import json
+from logging import getLogger
+from pathlib import Path
+from time import time
+from typing import Any
+
+from homeassistant.components.recorder.models import (
+    StatisticData,
+    StatisticMetaData,
+)
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import STORAGE_DIR, Store
+from homeassistant.util import slugify
+
+from .const import DOMAIN
+from .devices import Device
+from .hub import PetLibroHub
+
+_LOGGER = getLogger(__name__)
+
+HISTORY_SYNC_INTERVAL = timedelta(minutes=30)
+HISTORY_INITIAL_DAYS = 7
+HISTORY_PAGE_SIZE = 50
+HISTORY_MAX_PAGES = 20
+# Records are synced oldest first by windows of at most this length, a
+# window with more than HISTORY_MAX_PAGES pages is split down to the minimum
+HISTORY_WINDOW_MS = 86_400_000
+HISTORY_MIN_WINDOW_MS = 60_000
+STORAGE_VERSION = 1
+# Size of the end of the history file read to find its last record
+TAIL_BYTES = 4096
+
+
+def history_path(hass: HomeAssistant, serial: str) -> Path:
+    """Return the path of the history file of a device."""
+    return Path(hass.config.path(STORAGE_DIR, f"{DOMAIN}_history", f"{serial}.ndjson"))
+
+
+def _flatten(data: Any) -> Iterator[dict]:
+    """Yield the work records of a response, grouped by day or not."""
+    for item in data or []:
+        if isinstance(item, dict) and "workRecords" in item:
+            yield from item["workRecords"] or []
+        elif isinstance(item, dict):
+            yield item
+
+
+def _record_key(record: dict) -> Any:
+    """Return what identifies a work record across pages."""
+    if (record_id := record.get("id")) is not None:
+        return record_id
+    return (int(record["recordTime"]), record.get("type"))
+
+
+class HistoryStore:
+    """Append-only NDJSON history of a device, and its sync cursor.
+
+    The cursor (last stored record time) and the running statistic sum live
+    in a small Home Assistant store next to the records, so a restart only
+    asks the API for records newer than the cursor. The records file is the
+    source of truth: records written before a crash prevented saving the
+    cursor are recovered from it on load instead of being downloaded again.
+    """
+
+    def __init__(self, hass: HomeAssistant, serial: str) -> None:
+        """Initialize the store of a device."""
+        self.hass = hass
+        self.path = history_path(hass, serial)
+        self._meta = Store[dict[str, Any]](
+            hass, STORAGE_VERSION, f"{DOMAIN}_history.{serial}"
+        )
+        self.cursor: int | None = None
+        self.stat_hour: int | None = None
+        self.stat_base = 0.0
+        self.stat_hour_total = 0.0
+
+    async def async_load(self) -> dict[int, float]:
+        """Load the cursor and statistic state.
+
+        :return: The hourly sums of the recovered records, if any
+        """
+        if meta := await self._meta.async_load():
+            self.cursor = meta.get("cursor")
+            self.stat_hour = meta.get("stat_hour")
+            self.stat_base = meta.get("stat_base", 0.0)
+            self.stat_hour_total = meta.get("stat_hour_total", 0.0)
+
+        if not (
+            recovered := await self.hass.async_add_executor_job(
+                self._read_unsaved, self.cursor
+            )
+        ):
+            return {}
+        _LOGGER.debug("Recovered %d records from %s", len(recovered), self.path)
+        sums = self._accumulate(recovered)
+        await self._async_save_meta()
+        return sums
+
+    def _read_unsaved(self, cursor: int | None) -> list[dict[str, Any]]:
+        """Return the records of the file newer than the saved cursor.
+
+        Only the end of the file is read when it holds no such record. A
+        line torn by a crash is truncated.
+        """
+        if not self.path.exists():
+            return []
+        with self.path.open("rb+") as file:
+            offset = file.seek(max(file.seek(0, 2) - TAIL_BYTES, 0))
+            tail = file.read()
+            if tail and not tail.endswith(b"\n"):
+                end = tail.rfind(b"\n") + 1
+                file.truncate(offset + end)
+                tail = tail[:end]
+        if not (lines := tail.splitlines()):
+            return []
+        if cursor is not None and json.loads(lines[-1])["time"] <= cursor:
+            return []
+
+        with self.path.open(encoding="utf-8") as file:
+            return [
+                record
+                for record in map(json.loads, file)
+                if cursor is None or record["time"] > cursor
+            ]
+
+    def _write(self, lines: list[str]) -> None:
+        """Append lines to the history file."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a", encoding="utf-8") as file:
+            file.writelines(lines)
+
+    def _accumulate(self, records: list[dict[str, Any]]) -> dict[int, float]:
+        """Add records sorted by time to the sums, return the hourly sums."""
+        sums: dict[int, float] = {}
+        for record in records:
+            hour = record["time"] // 3_600_000 * 3600
+            if self.stat_hour is None or hour > self.stat_hour:
+                if self.stat_hour is not None:
+                    self.stat_base += self.stat_hour_total
+                self.stat_hour, self.stat_hour_total = hour, 0.0
+            self.stat_hour_total += record["value"]
+            sums[hour] = self.stat_base + self.stat_hour_total
+        self.cursor = records[-1]["time"]
+        return sums
+
+    async def async_append(self, records: list[dict[str, Any]]) -> dict[int, float]:
+        """Append records sorted by time and return the updated hourly sums."""
+        await self.hass.async_add_executor_job(
+            self._write,
+            [json.dumps(record, separators=(",", ":")) + "\n" for record in records],
+        )
+        sums = self._accumulate(records)
+        await self._async_save_meta()
+        return sums
+
+    async def async_advance(self, cursor: int) -> None:
+        """Move the cursor past a period fully synced, with or without records."""
+        if self.cursor is None or cursor > self.cursor:
+            self.cursor = cursor
+            await self._async_save_meta()
+
+    async def _async_save_meta(self) -> None:
+        """Save the cursor and statistic state."""
+        await self._meta.async_save(
+            {
+                "cursor": self.cursor,
+                "stat_hour": self.stat_hour,
+                "stat_base": self.stat_base,
+                "stat_hour_total": self.stat_hour_total,
+            }
+        )
+
+
+class PetLibroHistory:
+    """Sync the work records of a hub's devices into the local history."""
+
+    def __init__(self, hass: HomeAssistant, hub: PetLibroHub) -> None:
+        """Initialize the history of a hub."""
+        self.hass = hass
+        self.hub = hub
+        self._stores: dict[str, HistoryStore] = {}
+
+    async def _store(self, device: Device) -> HistoryStore:
+        """Return the loaded store of a device."""
+        if (store := self._stores.get(device.serial)) is None:
+            store = HistoryStore(self.hass, device.serial)
+            if sums := await store.async_load():
+                self._import_statistics(device, sums)
+            self._stores[device.serial] = store
+        return store
+
+    def _record(self, device: Device, record: dict) -> dict[str, Any]:
+        """Return the compact form of a work record."""
+        return {
+            "time": int(record["recordTime"]),
+            "type": record.get("type"),
+            "value": device.history_value(record),
+        }
+
+    def _import_statistics(self, device: Device, sums: dict[int, float]) -> None:
+        """Import hourly sums as Home Assistant long-term statistics."""
+        if "recorder" not in self.hass.config.components:
+            return
+        async_add_external_statistics(
+            self.hass,
+            StatisticMetaData(
+                has_mean=False,
+                has_sum=True,
+                name=f"{device.name} history",
+                source=DOMAIN,
+                statistic_id=f"{DOMAIN}:{slugify(device.serial)}_history",
+                unit_of_measurement=device.history_unit,
+            ),
+            [
+                StatisticData(start=datetime.fromtimestamp(hour, UTC), sum=total)
+                for hour, total in sums.items()
+            ],
+        )
+
+    async def _fetch_window(
+        self, device: Device, start: int, end: int
+    ) -> tuple[list[dict[str, Any]], bool]:
+        """Fetch the records of a device within a time window.
+
+        :return: The records sorted by time, and whether they are all there
+        """
+        # The page order of the API is not relied upon: pages are followed
+        # towards whichever end they were cut from, until one is not full
+        records: dict[Any, dict[str, Any]] = {}
+        lower, upper = start, end
+        complete = False
+        for _ in range(HISTORY_MAX_PAGES):
+            page = list(
+                _flatten(
+                    await self.hub.api.device_work_records(
+                        device.serial,
+                        lower,
+                        upper,
+                        list(device.history_record_types),
+                        HISTORY_PAGE_SIZE,
+                    )
+                )
+            )
+            new = 0
+            for record in page:
+                if start <= int(record.get("recordTime") or 0) <= end and (
+                    key := _record_key(record)
+                ) not in records:
+                    records[key] = self._record(device, record)
+                    new += 1
+            if len(page) < HISTORY_PAGE_SIZE or not new:
+                complete = True
+                break
+            first, last = (
+                int(record.get("recordTime") or 0) for record in (page[0], page[-1])
+            )
+            if first > last:
+                upper = last  # Newest first, the older records are next
+            else:
+                lower = last
+        return sorted(records.values(), key=lambda record: record["time"]), complete
+
+    async def async_sync(self, device: Device) -> None:
+        """Fetch and store the records of a device newer than its cursor.
+
+        The records are synced oldest first, a window at a time, and each
+        window is stored before the next is fetched: a long downtime or a
+        busy device takes several windows, but every one is progress.
+        """
+        if not device.history_record_types:
+            return
+        store = await self._store(device)
+        end = int(time() * 1000)
+        lower = (
+            store.cursor + 1
+            if store.cursor is not None
+            else end - HISTORY_INITIAL_DAYS * 86_400_000
+        )
+
+        window = HISTORY_WINDOW_MS
+        while lower <= end:
+            upper = min(lower + window - 1, end)
+            records, complete = await self._fetch_window(device, lower, upper)
+            if not complete:
+                if window > HISTORY_MIN_WINDOW_MS:
+                    window //= 2
+                    continue
+                # The pages left would be missing from the stored history
+                _LOGGER.warning(
+                    "Too many records for %s, some are missing from its history",
+                    device.serial,
+                )
+            if records:
+                self._import_statistics(device, await store.async_append(records))
+            if upper < end:
+                # The last window stays open to the records still to come
+                await store.async_advance(upper)
+            lower = upper + 1
+            window = HISTORY_WINDOW_MS
+
+    async def async_sync_all(self, devices: Iterable[Device] | None = None) -> None:
+        """Sync the history of all the hub devices."""
+        results = await gather(
+            *(self.async_sync(device) for device in devices or self.hub.devices),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                _LOGGER.error("Unable to sync device history: %s", result)
@@ -1,41 +1,144 @@
 """Module providing a PetLibro hub wrapper class for interacting with PetLibro devices."""
 
-from asyncio import gather
-from collections.abc import Mapping
+from asyncio import Lock, gather, sleep, timeout
+from collections import deque
+from collections.abc import AsyncIterator, Callable, Mapping
+from dataclasses import dataclass, replace
 from datetime import timedelta
+from functools import partial
+import json
 from logging import getLogger
+from time import monotonic
 from typing import Any
 
 from aiohttp import ClientConnectorError, ClientResponseError
 from custom_components.petlibro.api import PetLibroAPI
 
-from homeassistant.const import CONF_API_TOKEN, CONF_REGION
-from homeassistant.core import HomeAssistant
+from homeassistant.const import CONF_API_TOKEN, CONF_REGION, CONF_URL, Platform
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
+from .aggregates import FleetAggregates
 from .api import PetLibroAPIError
-from .const import DOMAIN
+from .const import (
+    CONF_CLEANING_DAYS,
+    CONF_LOW_DESICCANT_DAYS,
+    CONF_LOW_REMAINING_WATER,
+    CONF_LOW_WATER_LEVEL,
+    DEFAULT_ALERT_THRESHOLDS,
+    DOMAIN,
+    EVENT_PETLIBRO_ALERT,
+)
 from .devices import Device, product_name_map
+from .devices.alerts import EVENT_ALERT, AlertRule
+from .devices.event import Event
+from .endpoints import parse_endpoints
+from .journal import UNREACHABLE_ERRORS, WriteJournal
+from .snapshot import SNAPSHOT_TTL_SECONDS, Snapshot, SnapshotCache
+from .stream import StreamRelay
+from .transport import PushTransport
 
 _LOGGER = getLogger(__name__)
 UPDATE_INTERVAL_SECONDS = 60 * 5
+ENDPOINT_PROBE_INTERVAL = timedelta(hours=1)
+# Consistency check interval while a push transport is connected
+PUSH_UPDATE_INTERVAL_SECONDS = 60 * 30
+# Maximum delay between two detailed refreshes of an offline device
+OFFLINE_BACKOFF_MAX_SECONDS = 60 * 60
+# Maximum age of the details of an online device whose list entry is unchanged
+DETAIL_MAX_AGE_SECONDS = 60 * 30
+# Time given to the detailed refreshes of a cycle, the rest is carried over
+REFRESH_BUDGET_SECONDS = 60
+# Detailed refreshes running at the same time
+REFRESH_CONCURRENCY = 4
+# Consecutive device lists a device must be missing from to be removed
+MISSING_LISTS_BEFORE_REMOVAL = 2
+
+# Hub events, emitted with the list of devices concerned
+EVENT_DEVICES_ADDED = "devices_added"
+EVENT_DEVICES_REMOVED = "devices_removed"
+
+
+def build_alert_rules(options: Mapping[str, Any]) -> list[AlertRule]:
+    """Build the alert rules from the config entry options."""
+    thresholds = DEFAULT_ALERT_THRESHOLDS | dict(options)
+    return [
+        AlertRule(
+            key="low_water_level",
+            property="water_level",
+            data_keys=frozenset({"weightPercent"}),
+            threshold=thresholds[CONF_LOW_WATER_LEVEL],
+            hysteresis=5,
+            debounce=60,
+        ),
+        AlertRule(
+            key="low_remaining_water",
+            property="remaining_water",
+            data_keys=frozenset({"weight"}),
+            threshold=thresholds[CONF_LOW_REMAINING_WATER],
+            hysteresis=50,
+            debounce=60,
+        ),
+        AlertRule(
+            key="low_desiccant",
+            property="remaining_desiccant",
+            data_keys=frozenset({"remainingDesiccantDays"}),
+            threshold=thresholds[CONF_LOW_DESICCANT_DAYS],
+            hysteresis=1,
+        ),
+        AlertRule(
+            key="cleaning_due",
+            property="days_before_cleaning",
+            data_keys=frozenset({"remainingCleaningDays"}),
+            threshold=thresholds[CONF_CLEANING_DAYS],
+            hysteresis=1,
+        ),
+    ]
+
+
+@dataclass
+class DeviceRefreshState:
+    """What the hub knows about the last detailed refresh of a device."""
+
+    fingerprint: str | None = None
+    refreshed_at: float = 0.0
+    offline_backoff: float = 0.0
+    next_offline_check: float = 0.0
+    carried_over: bool = False
+    missing_lists: int = 0
+
+    def staleness(self, now: float | None = None) -> float:
+        """Return the seconds elapsed since the last detailed refresh."""
+        return (monotonic() if now is None else now) - self.refreshed_at
 
 
 class PetLibroHub:
     """A PetLibro hub wrapper class."""
 
-    devices: list[Device] = []
+    devices: list[Device]
 
-    def __init__(self, hass: HomeAssistant, data: Mapping[str, Any]) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry_id: str,
+        data: Mapping[str, Any],
+        options: Mapping[str, Any] | None = None,
+    ) -> None:
         """Init the hub."""
+        self.hass = hass
+        self.entry_id = entry_id
         self._data = data
+        self.devices = []
+        self.options = dict(options or {})
+        self.alert_rules = build_alert_rules(self.options)
         self.session = None
         self.api = PetLibroAPI(
             async_get_clientsession(hass),
             hass.config.time_zone,
             data[CONF_REGION],
             data[CONF_API_TOKEN],
+            parse_endpoints(data.get(CONF_URL)),
         )
 
         self.coordinator = DataUpdateCoordinator(
@@ -45,6 +148,82 @@ class PetLibroHub:
             update_method=self.refresh_devices,
             update_interval=timedelta(seconds=UPDATE_INTERVAL_SECONDS),
         )
+        self.snapshots = SnapshotCache(self._fetch_snapshot)
+        self.streams: dict[str, StreamRelay] = {}
+        self.transport: PushTransport | None = None
+        self.refresh_states: dict[str, DeviceRefreshState] = {}
+        self.aggregates = FleetAggregates()
+        self._refresh_lock = Lock()
+        self.events = Event()
+        self.entity_adders: dict[Platform, Callable[[list[Device]], None]] = {}
+        self._unsupported: set[str] = set()
+        self.journal = WriteJournal(hass, entry_id, self._apply_command)
+
+    async def async_shutdown(self) -> None:
+        """Stop every background activity and release the devices."""
+        await self.async_stop_push()
+        await self.coordinator.async_shutdown()
+        for relay in self.streams.values():
+            relay.close()
+        self.streams.clear()
+        self.snapshots.clear()
+        for device in self.devices:
+            self.aggregates.remove_device(device)
+            device.close()
+        self.devices.clear()
+        self.refresh_states.clear()
+
+    def register_entity_adder(
+        self, platform: Platform, adder: Callable[[list[Device]], None]
+    ) -> Callable[[], None]:
+        """Register how a loaded platform adds the entities of new devices."""
+        self.entity_adders[platform] = adder
+
+        def unregister() -> None:
+            self.entity_adders.pop(platform, None)
+
+        return unregister
+
+    async def _apply_command(self, serial: str, key: str, value: Any) -> None:
+        """Send a command through the ``set_<key>`` method of a device."""
+        if (device := await self.get_device(serial)) is None:
+            raise ValueError(f"Unknown device {serial}")
+        await getattr(device, f"set_{key}")(value, refresh=False)
+
+    async def async_write(
+        self, device: Device, key: str, value: Any, refresh: bool = True
+    ) -> bool:
+        """Send a device command, or journal it if the API cannot be reached.
+
+        Commands are journaled right away while every endpoint is down, and
+        while earlier commands of the device are queued so they stay in
+        order. Only a failed write is journaled: once the command is sent,
+        failing to refresh the device afterwards is only logged.
+
+        :return: Whether the command was sent, rather than queued
+        """
+        if (
+            self.api.session.endpoints.available
+            and not self.journal.has_pending(device.serial)
+        ):
+            try:
+                await self._apply_command(device.serial, key, value)
+            except UNREACHABLE_ERRORS as ex:
+                _LOGGER.warning("Unable to reach the PETLIBRO API: %s", ex)
+            else:
+                if refresh:
+                    try:
+                        await device.refresh()
+                    except UNREACHABLE_ERRORS as ex:
+                        _LOGGER.warning(
+                            "Sent %s to %s but could not refresh it: %s",
+                            key,
+                            device.serial,
+                            ex,
+                        )
+                return True
+        await self.journal.async_enqueue(device.serial, key, value)
+        return False
 
     async def get_device(self, serial: str) -> Device | None:
         """If found, return the device with the specified serial number."""
@@ -53,26 +232,301 @@ class PetLibroHub:
             None,
         )
 
+    async def async_start_push(self, transport: PushTransport) -> None:
+        """Receive device state from a push transport alongside polling."""
+        await self.async_stop_push()
+        self.transport = transport
+        await transport.async_start(self._handle_push_message, self._handle_push_state)
+
+    async def async_stop_push(self) -> None:
+        """Stop the push transport and go back to regular polling."""
+        if (transport := self.transport) is not None:
+            self.transport = None
+            await transport.async_stop()
+            self._handle_push_state(False)
+
+    @callback
+    def _handle_push_message(self, serial: str, data: dict[str, Any]) -> None:
+        """Apply a pushed message to its device."""
+        if device := next(
+            (device for device in self.devices if device.serial == serial), None
+        ):
+            device.update_data(data)
+
+    @callback
+    def _handle_push_state(self, connected: bool) -> None:
+        """Slow down polling while push is healthy, fall back to it otherwise."""
+        interval = timedelta(
+            seconds=PUSH_UPDATE_INTERVAL_SECONDS
+            if connected
+            else UPDATE_INTERVAL_SECONDS
+        )
+        if self.coordinator.update_interval == interval:
+            return
+        _LOGGER.debug(
+            "Push transport %s, polling every %s",
+            "connected" if connected else "disconnected",
+            interval,
+        )
+        self.coordinator.update_interval = interval
+        if not connected and self.transport is not None:
+            # Catch up on what was missed since the transport dropped
+            self.hass.async_create_task(self.coordinator.async_request_refresh())
+
+    async def _fetch_snapshot(self, serial: str, previous: Snapshot | None) -> Snapshot:
+        """Fetch the last camera frame, skipping the download when unchanged."""
+        device = await self.get_device(serial)
+        if device is None or not (url := await device.snapshot_url()):
+            return Snapshot(None, fetched_at=monotonic())
+
+        if previous is None or previous.url != url:
+            previous = None
+        image, etag, last_modified = await self.api.session.get_file(
+            url,
+            previous.etag if previous else None,
+            previous.last_modified if previous else None,
+        )
+        if image is None and previous is not None:
+            return replace(previous, fetched_at=monotonic())
+        return Snapshot(image, url, etag, last_modified, monotonic())
+
+    async def _camera_frames(self, serial: str) -> AsyncIterator[bytes]:
+        """Yield each new camera frame of a device."""
+        last = None
+        while True:
+            image = await self.snapshots.async_get(serial)
+            if image is not None and image is not last:
+                last = image
+                yield image
+            await sleep(SNAPSHOT_TTL_SECONDS)
+
+    def stream_relay(self, serial: str) -> StreamRelay:
+        """Return the relay sharing the camera stream of a device."""
+        if (relay := self.streams.get(serial)) is None:
+            relay = self.streams[serial] = StreamRelay(
+                lambda: self._camera_frames(serial)
+            )
+        return relay
+
+    async def async_probe_endpoints(self, *_: Any) -> None:
+        """Route requests to the fastest endpoint, if there is a choice."""
+        if len(self.api.session.endpoints.candidates) > 1:
+            _LOGGER.debug("Using endpoint %s", await self.api.probe_endpoints())
+
+    @callback
+    def _fire_alert(self, device: Device, rule: AlertRule, active: bool) -> None:
+        """Fire a Home Assistant event when a device alert changes."""
+        self.hass.bus.async_fire(
+            EVENT_PETLIBRO_ALERT,
+            {
+                "serial": device.serial,
+                "name": device.name,
+                "alert": rule.key,
+                "active": active,
+                "value": getattr(device, rule.property),
+            },
+        )
+
     async def load_devices(self):
         """Get information about devices connected to the account."""
+        await self.journal.async_load()
         for device_data in await self.api.list_devices():
             if device := await self.get_device(device_data["deviceSn"]):
                 await device.refresh()
-            elif device_data["productName"] in product_name_map:
-                device = product_name_map[device_data["productName"]](
-                    device_data, self.api
-                )
-                await device.refresh()  # Get all API data
-                self.devices.append(device)
             else:
+                await self._load_device(device_data)
+        await self.journal.async_replay()
+
+    async def _load_device(self, device_data: dict) -> Device | None:
+        """Create, hydrate and register the device of a list entry."""
+        if (product := product_name_map.get(device_data["productName"])) is None:
+            if device_data["deviceSn"] not in self._unsupported:
+                self._unsupported.add(device_data["deviceSn"])
                 _LOGGER.error(
                     "Unsupported device found: %s", device_data["productName"]
                 )
+            return None
 
-    async def refresh_devices(self) -> bool:
-        """Update all known devices states from the PETLIBRO API."""
+        await self.hass.async_add_import_executor_job(product.load_class)
+        device = product.create(device_data, self.api)
+        await device.refresh()  # Get all API data
+        self.refresh_states[device.serial] = DeviceRefreshState(
+            self._fingerprint(device_data), monotonic()
+        )
+        self.devices.append(device)
+        self.aggregates.add_device(device)
+        device.on(EVENT_ALERT, partial(self._fire_alert, device))
+        device.configure_alerts(self.alert_rules)
+        return device
+
+    def _remove_device(self, device: Device) -> None:
+        """Unregister a device and release everything it holds."""
+        self.devices.remove(device)
+        self.aggregates.remove_device(device)
+        self.refresh_states.pop(device.serial, None)
+        if (relay := self.streams.pop(device.serial, None)) is not None:
+            relay.close()
+        self.snapshots.discard(device.serial)
+        device.close()
+
+    async def _reconcile_devices(self, listed: dict[str, dict]) -> None:
+        """Load the devices new to the account and drop the ones gone from it.
+
+        Devices present in the hub and in the list are left untouched. A
+        device is only removed once missing from MISSING_LISTS_BEFORE_REMOVAL
+        consecutive lists, so a partial answer does not drop it.
+        """
+        known = {device.serial for device in self.devices}
+        added = []
+        for serial, device_data in listed.items():
+            if serial in known or serial in self._unsupported:
+                continue
+            try:
+                if device := await self._load_device(device_data):
+                    added.append(device)
+            except (PetLibroAPIError, ClientResponseError, ClientConnectorError) as ex:
+                _LOGGER.error("Unable to load device %s: %s", serial, ex)
+
+        removed = []
+        for device in tuple(self.devices):
+            state = self.refresh_states.setdefault(device.serial, DeviceRefreshState())
+            if device.serial in listed:
+                state.missing_lists = 0
+                continue
+            state.missing_lists += 1
+            if state.missing_lists >= MISSING_LISTS_BEFORE_REMOVAL:
+                self._remove_device(device)
+                removed.append(device)
+
+        if added:
+            _LOGGER.info("New devices found: %s", ", ".join(d.serial for d in added))
+            self.events.emit(EVENT_DEVICES_ADDED, added)
+        if removed:
+            _LOGGER.info("Devices removed: %s", ", ".join(d.serial for d in removed))
+            self.events.emit(EVENT_DEVICES_REMOVED, removed)
+
+    @staticmethod
+    def _fingerprint(device_data: dict) -> str:
+        """Return a comparable summary of a device list entry."""
+        return json.dumps(device_data, sort_keys=True, default=str)
+
+    def _needs_refresh(self, device: Device, device_data: dict, now: float) -> bool:
+        """Apply a device list entry and tell if a detailed refresh is needed.
+
+        Online devices are refreshed when their list entry changed since
+        their last detailed refresh, or when their details are older than
+        DETAIL_MAX_AGE_SECONDS, for the state only found in the details.
+        Offline devices are re-checked with an exponential backoff.
+        """
+        device.update_data(device_data)
+        state = self.refresh_states.setdefault(device.serial, DeviceRefreshState())
+
+        if not device.online:
+            if now < state.next_offline_check:
+                return False
+            state.offline_backoff = min(
+                max(state.offline_backoff * 2, UPDATE_INTERVAL_SECONDS),
+                OFFLINE_BACKOFF_MAX_SECONDS,
+            )
+            state.next_offline_check = now + state.offline_backoff
+            return True
+
+        state.offline_backoff = state.next_offline_check = 0.0
+        return (
+            state.fingerprint != self._fingerprint(device_data)
+            or state.staleness(now) >= DETAIL_MAX_AGE_SECONDS
+        )
+
+    async def _refresh_device(self, device: Device, device_data: dict) -> None:
+        """Refresh the details of a device and remember its list entry."""
+        state = self.refresh_states[device.serial]
         try:
-            await gather(*(device.refresh() for device in self.devices))
+            await device.refresh()
         except (PetLibroAPIError, ClientResponseError, ClientConnectorError) as ex:
-            _LOGGER.error("Unable to refresh your devices: %s", ex)
+            _LOGGER.error("Unable to refresh device %s: %s", device.serial, ex)
+            state.carried_over = False
+            return
+        state.fingerprint = self._fingerprint(device_data)
+        state.refreshed_at = monotonic()
+        state.carried_over = False
+
+    def _refresh_order(
+        self, pending: list[tuple[Device, dict]], now: float
+    ) -> list[tuple[Device, dict]]:
+        """Sort the devices to refresh, most urgent first.
+
+        Devices left over by the previous cycle come first, then the devices
+        reporting an urgent state, then the stalest ones.
+        """
+        states = self.refresh_states
+        return sorted(
+            pending,
+            key=lambda item: (
+                states[item[0].serial].carried_over,
+                item[0].refresh_priority,
+                states[item[0].serial].staleness(now),
+            ),
+            reverse=True,
+        )
+
+    async def refresh_devices(self) -> bool:
+        """Update all known devices states from the PETLIBRO API.
+
+        A single device list call reconciles the devices of the hub with the
+        account and decides which devices need the detailed per-device
+        calls. These run by urgency within REFRESH_BUDGET_SECONDS,
+        the devices not refreshed in time are carried over to the next cycle.
+        A cycle starting while another one is running is skipped.
+        """
+        if self._refresh_lock.locked():
+            _LOGGER.debug("Refresh cycle still running, skipping this one")
+            return True
+
+        async with self._refresh_lock:
+            try:
+                listed = {
+                    device_data["deviceSn"]: device_data
+                    for device_data in await self.api.list_devices()
+                }
+            except (PetLibroAPIError, ClientResponseError, ClientConnectorError) as ex:
+                _LOGGER.error("Unable to refresh your devices: %s", ex)
+                return True
+
+            await self._reconcile_devices(listed)
+            # The API answered, send what was queued while it did not
+            await self.journal.async_replay()
+            now = monotonic()
+            pending = [
+                (device, listed[device.serial])
+                for device in self.devices
+                if device.serial in listed
+                and (
+                    self._needs_refresh(device, listed[device.serial], now)
+                    or self.refresh_states[device.serial].carried_over
+                )
+            ]
+            for device, _ in pending:
+                self.refresh_states[device.serial].carried_over = True
+            queue = deque(self._refresh_order(pending, now))
+
+            async def worker() -> None:
+                while queue:
+                    await self._refresh_device(*queue.popleft())
+
+            try:
+                async with timeout(REFRESH_BUDGET_SECONDS):
+                    await gather(
+                        *(worker() for _ in range(min(REFRESH_CONCURRENCY, len(queue))))
+                    )
+            except TimeoutError:
+                pass
+
+            if carried := [
+                device.serial
+                for device, _ in pending
+                if self.refresh_states[device.serial].carried_over
+            ]:
+                _LOGGER.debug(
+                    "Refresh budget exhausted, carrying over %s", ", ".join(carried)
+                )
         return True
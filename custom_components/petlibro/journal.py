@@ -0,0 +1,179 @@
+"""Write-ahead journal of the device commands issued while the API is down."""
+
+from __future__ import annotations
+
+from asyncio import Lock, Semaphore, gather
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+from logging import getLogger
+from time import time
+from typing import Any
+
+from aiohttp import ClientError
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import BULK_WRITE_CONCURRENCY, DOMAIN
+from .devices.event import EVENT_UPDATE, Event
+from .exceptions import PetLibroAPIError, PetLibroCannotConnect, PetLibroInvalidAuth
+
+_LOGGER = getLogger(__name__)
+
+STORAGE_VERSION = 1
+# Errors meaning the API could not be reached, the command can be retried
+UNREACHABLE_ERRORS: tuple[type[Exception], ...] = (
+    ClientError,
+    TimeoutError,
+    PetLibroCannotConnect,
+)
+# Errors meaning the command itself was refused, retrying it is pointless.
+# An expired token is not one: the commands wait for the reauthentication.
+REJECTED_ERRORS: tuple[type[Exception], ...] = (PetLibroAPIError, ValueError)
+# Commands only meaning something on the day they were issued
+DAY_SCOPED_KEYS = frozenset({"feeding_plan_today_all"})
+
+
+@dataclass
+class JournalEntry:
+    """A device command waiting to be sent."""
+
+    serial: str
+    key: str
+    value: Any
+    queued_at: float
+
+    @property
+    def expired(self) -> bool:
+        """Return whether the command was issued for a day that is over."""
+        return (
+            self.key in DAY_SCOPED_KEYS
+            and dt_util.as_local(datetime.fromtimestamp(self.queued_at, UTC)).date()
+            != dt_util.now().date()
+        )
+
+
+class WriteJournal(Event):
+    """Persistent queue of device commands, replayed once the API is back.
+
+    Only the last command of each device and key is kept, a newer one
+    supersedes it. Commands are replayed in the order they were queued for
+    each device, with the devices replayed concurrently. Every change of the
+    queue emits an update event.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry_id: str,
+        apply: Callable[[str, str, Any], Awaitable[Any]],
+    ) -> None:
+        """Initialize the journal of a config entry."""
+        super().__init__()
+        self._store = Store[list[dict[str, Any]]](
+            hass, STORAGE_VERSION, f"{DOMAIN}_journal.{entry_id}"
+        )
+        self._apply = apply
+        self._replay_lock = Lock()
+        self.entries: dict[tuple[str, str], JournalEntry] = {}
+
+    @property
+    def depth(self) -> int:
+        """Return the number of queued commands."""
+        return len(self.entries)
+
+    @property
+    def oldest(self) -> datetime | None:
+        """Return when the oldest queued command was issued."""
+        if not self.entries:
+            return None
+        return datetime.fromtimestamp(
+            min(entry.queued_at for entry in self.entries.values()), UTC
+        )
+
+    def has_pending(self, serial: str) -> bool:
+        """Return whether commands are queued for a device."""
+        return any(entry.serial == serial for entry in self.entries.values())
+
+    async def async_load(self) -> None:
+        """Load the commands queued before a restart."""
+        for data in await self._store.async_load() or []:
+            entry = JournalEntry(**data)
+            self.entries[(entry.serial, entry.key)] = entry
+        if self.entries:
+            self.emit(EVENT_UPDATE)
+
+    async def _async_save(self) -> None:
+        """Persist the queue and report the change."""
+        await self._store.async_save([asdict(entry) for entry in self.entries.values()])
+        self.emit(EVENT_UPDATE)
+
+    async def async_enqueue(self, serial: str, key: str, value: Any) -> None:
+        """Queue a command, superseding the queued one for the same key."""
+        self.entries.pop((serial, key), None)
+        self.entries[(serial, key)] = JournalEntry(serial, key, value, time())
+        _LOGGER.info("Queued %s=%s for %s until the API is reachable", key, value, serial)
+        await self._async_save()
+
+    async def async_replay(self) -> None:
+        """Send the queued commands, keeping those the API could not receive.
+
+        A device stops replaying at its first error other than a rejection,
+        so its commands are never sent out of order, and the failed command
+        is kept for the next replay. A command the API rejects is dropped,
+        and so is a command for a day that is over.
+        """
+        if not self.entries or self._replay_lock.locked():
+            return
+
+        async with self._replay_lock:
+            by_device: dict[str, list[JournalEntry]] = {}
+            for entry in tuple(self.entries.values()):
+                if entry.expired:
+                    _LOGGER.warning(
+                        "Dropping %s=%s for %s, the day it was issued for is over",
+                        entry.key,
+                        entry.value,
+                        entry.serial,
+                    )
+                    del self.entries[(entry.serial, entry.key)]
+                    continue
+                by_device.setdefault(entry.serial, []).append(entry)
+            semaphore = Semaphore(BULK_WRITE_CONCURRENCY)
+
+            async def replay(entries: list[JournalEntry]) -> None:
+                async with semaphore:
+                    for entry in entries:
+                        try:
+                            await self._apply(entry.serial, entry.key, entry.value)
+                        except UNREACHABLE_ERRORS as ex:
+                            _LOGGER.debug("API still unreachable: %s", ex)
+                            return
+                        except PetLibroInvalidAuth:
+                            _LOGGER.debug("Waiting for a new token to replay")
+                            return
+                        except REJECTED_ERRORS as ex:
+                            _LOGGER.error(
+                                "Dropping %s=%s for %s: %s",
+                                entry.key,
+                                entry.value,
+                                entry.serial,
+                                ex,
+                            )
+                        except Exception as ex:  # pylint: disable=broad-except
+                            _LOGGER.error(
+                                "Keeping %s=%s for %s queued: %s",
+                                entry.key,
+                                entry.value,
+                                entry.serial,
+                                ex,
+                            )
+                            return
+                        # Keep a newer command queued while this one was sent
+                        if self.entries.get((entry.serial, entry.key)) is entry:
+                            del self.entries[(entry.serial, entry.key)]
+
+            await gather(*(replay(entries) for entries in by_device.values()))
+            await self._async_save()
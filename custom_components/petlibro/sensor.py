@@ -4,23 +4,40 @@ from __future__ import annotations
 
 from collections.abc import Callable
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timedelta
 from functools import cached_property
 from logging import getLogger
-from typing import Any, cast
+from typing import TYPE_CHECKING, Any, cast
 
 from homeassistant.components.sensor import SensorEntity, SensorEntityDescription
 from homeassistant.components.sensor.const import SensorDeviceClass, SensorStateClass
-from homeassistant.const import PERCENTAGE, UnitOfMass, UnitOfTime, UnitOfVolume
-from homeassistant.core import HomeAssistant
+from homeassistant.const import (
+    PERCENTAGE,
+    EntityCategory,
+    Platform,
+    UnitOfMass,
+    UnitOfTime,
+    UnitOfVolume,
+)
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_track_time_interval
 
 from . import PetLibroHubConfigEntry
+from .aggregates import FleetAggregates
 from .devices import Device
-from .devices.feeders.feeder import Feeder
-from .devices.feeders.granary_feeder import GranaryFeeder
-from .devices.fountains.dockstream_smart_fountain import DockstreamSmartFountain
-from .entity import PetLibroEntity, PetLibroEntityDescription, _DeviceT
+from .devices.event import EVENT_UPDATE
+from .entity import (
+    DescriptionIndex,
+    PetLibroEntity,
+    PetLibroEntityDescription,
+    _DeviceT,
+)
+from .journal import WriteJournal
+
+if TYPE_CHECKING:
+    from .devices.feeders.feeder import Feeder
+    from .devices.fountains.dockstream_smart_fountain import DockstreamSmartFountain
 
 _LOGGER = getLogger(__name__)
 
@@ -60,6 +77,10 @@ class PetLibroSensorEntityDescription(
     native_unit_of_measurement_fn: Callable[[_DeviceT], str | None] = lambda _: None
     device_class_fn: Callable[[_DeviceT], SensorDeviceClass | None] = lambda _: None
     should_report: Callable[[_DeviceT], bool] = lambda _: True
+    extra_state_attributes_fn: Callable[[_DeviceT], dict[str, Any] | None] = (
+        lambda _: None
+    )
+    update_interval: timedelta | None = None
 
 
 class PetLibroSensorEntity(PetLibroEntity[_DeviceT], SensorEntity):  # type: ignore [reportIncompatibleVariableOverride]
@@ -67,18 +88,16 @@ class PetLibroSensorEntity(PetLibroEntity[_DeviceT], SensorEntity):  # type: ign
 
     entity_description: PetLibroSensorEntityDescription[_DeviceT]  # type: ignore [reportIncompatibleVariableOverride]
 
-    @cached_property
+    @property
     def native_value(self) -> float | datetime | str | None:
         """Return the state."""
         if self.entity_description.should_report(self.device):
-            if isinstance(
-                val := getattr(self.device, self.entity_description.key), str
-            ):
+            if isinstance(val := self.value, str):
                 return val.lower()
             return cast(float | datetime | None, val)
         return None
 
-    @cached_property
+    @property
     def icon(self) -> str | None:
         """Return the icon to use in the frontend, if any."""
         if (icon := self.entity_description.icon_fn(self.state)) is not None:
@@ -104,15 +123,86 @@ class PetLibroSensorEntity(PetLibroEntity[_DeviceT], SensorEntity):  # type: ign
             return device_class
         return super().device_class
 
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return entity specific state attributes."""
+        return self.entity_description.extra_state_attributes_fn(self.device)
+
+    async def async_added_to_hass(self) -> None:
+        """Set up a listener and, if required, a refresh between polls."""
+        await super().async_added_to_hass()
+        if self.entity_description.update_interval is not None:
+            self.async_on_remove(
+                async_track_time_interval(
+                    self.hass,
+                    self._async_write_between_polls,
+                    self.entity_description.update_interval,
+                )
+            )
+
+    @callback
+    def _async_write_between_polls(self, _: datetime) -> None:
+        """Write the locally computed state between two polls."""
+        self.async_write_ha_state()
+
+
+def estimate_attributes(key: str) -> Callable[[DockstreamSmartFountain], dict]:
+    """Return a function exposing the confidence of a fountain estimate."""
+
+    def attributes(device: DockstreamSmartFountain) -> dict[str, Any]:
+        estimate = device.estimate(key)
+        return {"confidence": estimate.confidence if estimate else 0.0}
 
-DEVICE_SENSOR_MAP: dict[type[Device], list[PetLibroSensorEntityDescription]] = {
-    GranaryFeeder: [
-        PetLibroSensorEntityDescription[GranaryFeeder](
+    return attributes
+
+
+ESTIMATE_UPDATE_INTERVAL = timedelta(seconds=30)
+SCHEDULE_UPDATE_INTERVAL = timedelta(minutes=1)
+
+
+DEVICE_SENSOR_MAP: dict[str, list[PetLibroSensorEntityDescription]] = {
+    "Device": [
+        PetLibroSensorEntityDescription[Device](
+            key="last_refreshed",
+            translation_key="last_refreshed",
+            icon="mdi:update",
+            device_class=SensorDeviceClass.TIMESTAMP,
+            entity_category=EntityCategory.DIAGNOSTIC,
+            entity_registry_enabled_default=False,
+            update_interval=SCHEDULE_UPDATE_INTERVAL,
+        ),
+    ],
+    "Feeder": [
+        PetLibroSensorEntityDescription["Feeder"](
+            key="next_feeding_time",
+            translation_key="next_feeding_time",
+            icon="mdi:clock-outline",
+            device_class=SensorDeviceClass.TIMESTAMP,
+            update_interval=SCHEDULE_UPDATE_INTERVAL,
+        ),
+        PetLibroSensorEntityDescription["Feeder"](
+            key="next_feeding_portion",
+            translation_key="next_feeding_portion",
+            icon="mdi:bowl",
+            native_unit_of_measurement_fn=unit_of_measurement_feeder,
+            device_class_fn=device_class_feeder,
+            update_interval=SCHEDULE_UPDATE_INTERVAL,
+        ),
+        PetLibroSensorEntityDescription["Feeder"](
+            key="remaining_meals_today",
+            translation_key="remaining_meals_today",
+            icon="mdi:calendar-clock",
+            state_class=SensorStateClass.MEASUREMENT,
+            update_interval=SCHEDULE_UPDATE_INTERVAL,
+        ),
+    ],
+    "GranaryFeeder": [
+        PetLibroSensorEntityDescription["GranaryFeeder"](
             key="remaining_desiccant",
             translation_key="remaining_desiccant",
             icon="mdi:package",
         ),
-        PetLibroSensorEntityDescription[GranaryFeeder](
+        PetLibroSensorEntityDescription["GranaryFeeder"](
             key="today_feeding_quantity",
             translation_key="today_feeding_quantity",
             icon="mdi:scale",
@@ -120,22 +210,22 @@ DEVICE_SENSOR_MAP: dict[type[Device], list[PetLibroSensorEntityDescription]] = {
             device_class_fn=device_class_feeder,
             state_class=SensorStateClass.TOTAL_INCREASING,
         ),
-        PetLibroSensorEntityDescription[GranaryFeeder](
+        PetLibroSensorEntityDescription["GranaryFeeder"](
             key="today_feeding_times",
             translation_key="today_feeding_times",
             icon="mdi:history",
             state_class=SensorStateClass.TOTAL_INCREASING,
         ),
     ],
-    DockstreamSmartFountain: [
-        PetLibroSensorEntityDescription[DockstreamSmartFountain](
+    "DockstreamSmartFountain": [
+        PetLibroSensorEntityDescription["DockstreamSmartFountain"](
             key="water_level",
             translation_key="water_level",
             icon="mdi:water-percent",
             state_class=SensorStateClass.TOTAL,
             native_unit_of_measurement=PERCENTAGE,
         ),
-        PetLibroSensorEntityDescription[DockstreamSmartFountain](
+        PetLibroSensorEntityDescription["DockstreamSmartFountain"](
             key="remaining_water",
             translation_key="remaining_water",
             icon="mdi:water",
@@ -143,7 +233,7 @@ DEVICE_SENSOR_MAP: dict[type[Device], list[PetLibroSensorEntityDescription]] = {
             device_class=SensorDeviceClass.VOLUME,
             native_unit_of_measurement=UnitOfVolume.MILLILITERS,
         ),
-        PetLibroSensorEntityDescription[DockstreamSmartFountain](
+        PetLibroSensorEntityDescription["DockstreamSmartFountain"](
             key="today_water_consumption",
             translation_key="today_water_consumption",
             icon="mdi:fountain",
@@ -151,7 +241,7 @@ DEVICE_SENSOR_MAP: dict[type[Device], list[PetLibroSensorEntityDescription]] = {
             device_class=SensorDeviceClass.VOLUME,
             native_unit_of_measurement=UnitOfVolume.MILLILITERS,
         ),
-        PetLibroSensorEntityDescription[DockstreamSmartFountain](
+        PetLibroSensorEntityDescription["DockstreamSmartFountain"](
             key="days_before_filter_replacement",
             translation_key="days_before_filter_replacement",
             icon="mdi:counter",
@@ -159,7 +249,7 @@ DEVICE_SENSOR_MAP: dict[type[Device], list[PetLibroSensorEntityDescription]] = {
             device_class=SensorDeviceClass.DURATION,
             native_unit_of_measurement=UnitOfTime.DAYS,
         ),
-        PetLibroSensorEntityDescription[DockstreamSmartFountain](
+        PetLibroSensorEntityDescription["DockstreamSmartFountain"](
             key="days_before_cleaning",
             translation_key="days_before_cleaning",
             icon="mdi:counter",
@@ -167,8 +257,171 @@ DEVICE_SENSOR_MAP: dict[type[Device], list[PetLibroSensorEntityDescription]] = {
             device_class=SensorDeviceClass.DURATION,
             native_unit_of_measurement=UnitOfTime.DAYS,
         ),
+        PetLibroSensorEntityDescription["DockstreamSmartFountain"](
+            key="estimated_water_level",
+            translation_key="estimated_water_level",
+            icon="mdi:water-percent",
+            state_class=SensorStateClass.MEASUREMENT,
+            native_unit_of_measurement=PERCENTAGE,
+            entity_registry_enabled_default=False,
+            extra_state_attributes_fn=estimate_attributes("weightPercent"),
+            update_interval=ESTIMATE_UPDATE_INTERVAL,
+        ),
+        PetLibroSensorEntityDescription["DockstreamSmartFountain"](
+            key="estimated_remaining_water",
+            translation_key="estimated_remaining_water",
+            icon="mdi:water",
+            state_class=SensorStateClass.MEASUREMENT,
+            device_class=SensorDeviceClass.VOLUME,
+            native_unit_of_measurement=UnitOfVolume.MILLILITERS,
+            entity_registry_enabled_default=False,
+            extra_state_attributes_fn=estimate_attributes("weight"),
+            update_interval=ESTIMATE_UPDATE_INTERVAL,
+        ),
+        PetLibroSensorEntityDescription["DockstreamSmartFountain"](
+            key="estimated_today_water_consumption",
+            translation_key="estimated_today_water_consumption",
+            icon="mdi:fountain",
+            state_class=SensorStateClass.TOTAL_INCREASING,
+            device_class=SensorDeviceClass.VOLUME,
+            native_unit_of_measurement=UnitOfVolume.MILLILITERS,
+            entity_registry_enabled_default=False,
+            extra_state_attributes_fn=estimate_attributes("todayTotalMl"),
+            update_interval=ESTIMATE_UPDATE_INTERVAL,
+        ),
     ],
 }
+DEVICE_SENSOR_DESCRIPTIONS = DescriptionIndex(DEVICE_SENSOR_MAP)
+
+
+AGGREGATE_SENSORS: list[SensorEntityDescription] = [
+    # Fleet totals are sums of daily counters of devices that reset, join
+    # and leave independently, so they are measurements and not totals
+    SensorEntityDescription(
+        key="total_feeding_quantity",
+        translation_key="total_feeding_quantity",
+        icon="mdi:scale",
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SensorEntityDescription(
+        key="total_water_consumption",
+        translation_key="total_water_consumption",
+        icon="mdi:fountain",
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfVolume.MILLILITERS,
+    ),
+    SensorEntityDescription(
+        key="minimum_water_level",
+        translation_key="minimum_water_level",
+        icon="mdi:water-percent",
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=PERCENTAGE,
+    ),
+    SensorEntityDescription(
+        key="maintenance_required",
+        translation_key="maintenance_required",
+        icon="mdi:wrench-clock",
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+]
+
+
+class PetLibroAggregateSensorEntity(SensorEntity):
+    """PETLIBRO fleet aggregate sensor entity."""
+
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+
+    def __init__(
+        self,
+        aggregates: FleetAggregates,
+        entry_id: str,
+        description: SensorEntityDescription,
+    ) -> None:
+        """Initialize the aggregate sensor."""
+        self.aggregates = aggregates
+        self.entity_description = description
+        self._attr_unique_id = f"{entry_id}-{description.key}"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the aggregate value."""
+        return self.aggregates.values.get(self.entity_description.key)
+
+    @property
+    def native_unit_of_measurement(self) -> str | None:
+        """Return the unit pinned by the aggregate, if any."""
+        key = self.entity_description.key
+        if (unit := self.aggregates.units.get(key)) is not None:
+            return unit
+        return self.entity_description.native_unit_of_measurement
+
+    async def async_added_to_hass(self) -> None:
+        """Write the state when the aggregate changes."""
+        self.async_on_remove(
+            self.aggregates.on(
+                EVENT_UPDATE,
+                self.async_write_ha_state,
+                keys={self.entity_description.key},
+            )
+        )
+
+
+@dataclass(frozen=True)
+class PetLibroJournalSensorEntityDescription(SensorEntityDescription):
+    """A class that describes write journal sensor entities."""
+
+    value_fn: Callable[[WriteJournal], Any] = lambda _: None
+
+
+JOURNAL_SENSORS: list[PetLibroJournalSensorEntityDescription] = [
+    PetLibroJournalSensorEntityDescription(
+        key="pending_commands",
+        translation_key="pending_commands",
+        icon="mdi:tray-full",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda journal: journal.depth,
+    ),
+    PetLibroJournalSensorEntityDescription(
+        key="oldest_pending_command",
+        translation_key="oldest_pending_command",
+        icon="mdi:clock-alert-outline",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda journal: journal.oldest,
+    ),
+]
+
+
+class PetLibroJournalSensorEntity(SensorEntity):
+    """PETLIBRO write journal sensor entity."""
+
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+    entity_description: PetLibroJournalSensorEntityDescription
+
+    def __init__(
+        self,
+        journal: WriteJournal,
+        entry_id: str,
+        description: PetLibroJournalSensorEntityDescription,
+    ) -> None:
+        """Initialize the journal sensor."""
+        self.journal = journal
+        self.entity_description = description
+        self._attr_unique_id = f"{entry_id}-{description.key}"
+
+    @property
+    def native_value(self) -> Any:
+        """Return the journal value."""
+        return self.entity_description.value_fn(self.journal)
+
+    async def async_added_to_hass(self) -> None:
+        """Write the state when the journal changes."""
+        self.async_on_remove(
+            self.journal.on(EVENT_UPDATE, self.async_write_ha_state)
+        )
 
 
 async def async_setup_entry(
@@ -178,11 +431,35 @@ async def async_setup_entry(
 ) -> None:
     """Set up PETLIBRO sensors using config entry."""
     hub = entry.runtime_data
-    entities = [
-        PetLibroSensorEntity(device, hub, description)
-        for device in hub.devices
-        for device_type, entity_descriptions in DEVICE_SENSOR_MAP.items()
-        if isinstance(device, device_type)
-        for description in entity_descriptions
-    ]
-    async_add_entities(entities)
+    aggregated: set[str] = set()
+
+    def add_entities(devices: list[Device]) -> None:
+        entities: list[SensorEntity] = [
+            PetLibroSensorEntity(device, hub, description)
+            for device in devices
+            for description in DEVICE_SENSOR_DESCRIPTIONS.get(device)
+        ]
+        # Aggregates are added with the first device of their type
+        new_aggregates = [
+            description
+            for description in AGGREGATE_SENSORS
+            for aggregate in hub.aggregates.aggregates
+            if aggregate.key == description.key
+            and description.key not in aggregated
+            and any(aggregate.applies_to(device) for device in devices)
+        ]
+        aggregated.update(description.key for description in new_aggregates)
+        entities.extend(
+            PetLibroAggregateSensorEntity(
+                hub.aggregates, entry.entry_id, description
+            )
+            for description in new_aggregates
+        )
+        async_add_entities(entities)
+
+    add_entities(hub.devices)
+    entry.async_on_unload(hub.register_entity_adder(Platform.SENSOR, add_entities))
+    async_add_entities(
+        PetLibroJournalSensorEntity(hub.journal, entry.entry_id, description)
+        for description in JOURNAL_SENSORS
+    )
@@ -0,0 +1,216 @@
+"""Services for controlling many PETLIBRO devices at once."""
+
+from __future__ import annotations
+
+from asyncio import Semaphore, gather
+from datetime import datetime
+from logging import getLogger
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import voluptuous as vol
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import (
+    config_validation as cv,
+    device_registry as dr,
+    entity_registry as er,
+)
+from homeassistant.helpers.service import async_extract_referenced_entity_ids
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    BULK_WRITE_CONCURRENCY,
+    DOMAIN,
+    SERVICE_EXPORT_HISTORY,
+    SERVICE_SET_FEEDING_PLAN,
+    SERVICE_SKIP_TODAY,
+)
+from .devices import Device
+from .export import EXPORT_FORMATS, iter_chunks, iter_records, write_chunks
+from .history import history_path
+from .hub import PetLibroHub
+
+if TYPE_CHECKING:
+    from .devices.feeders.feeder import Feeder
+
+_LOGGER = getLogger(__name__)
+
+ATTR_ENABLE = "enable"
+ATTR_SKIP = "skip"
+ATTR_FORMAT = "format"
+ATTR_START = "start"
+ATTR_END = "end"
+ATTR_COMPRESS = "compress"
+
+EXPORT_DIR = "petlibro_exports"
+
+SET_FEEDING_PLAN_SCHEMA = cv.make_entity_service_schema(
+    {vol.Required(ATTR_ENABLE): cv.boolean}
+)
+SKIP_TODAY_SCHEMA = cv.make_entity_service_schema(
+    {vol.Optional(ATTR_SKIP, default=True): cv.boolean}
+)
+EXPORT_HISTORY_SCHEMA = cv.make_entity_service_schema(
+    {
+        vol.Optional(ATTR_FORMAT, default="ndjson"): vol.In(EXPORT_FORMATS),
+        vol.Optional(ATTR_START): cv.datetime,
+        vol.Optional(ATTR_END): cv.datetime,
+        vol.Optional(ATTR_COMPRESS, default=False): cv.boolean,
+    }
+)
+
+
+def loaded_hubs(hass: HomeAssistant) -> list[PetLibroHub]:
+    """Return the hubs of every loaded PETLIBRO config entry."""
+    return [
+        entry.runtime_data
+        for entry in hass.config_entries.async_entries(DOMAIN)
+        if entry.state is ConfigEntryState.LOADED
+    ]
+
+
+def _targeted_devices(
+    hass: HomeAssistant, call: ServiceCall, device_type: str
+) -> list[tuple[PetLibroHub, Device]]:
+    """Resolve the devices, areas and entities of a call to PETLIBRO devices.
+
+    Only the devices of the type given by class name are kept.
+    """
+    selected = async_extract_referenced_entity_ids(hass, call)
+    device_registry = dr.async_get(hass)
+    entity_registry = er.async_get(hass)
+
+    device_ids = set(selected.referenced_devices)
+    for entity_id in selected.referenced | selected.indirectly_referenced:
+        if (entry := entity_registry.async_get(entity_id)) and entry.device_id:
+            device_ids.add(entry.device_id)
+
+    serials = {
+        identifier[1]
+        for device_id in device_ids
+        if (device_entry := device_registry.async_get(device_id))
+        for identifier in device_entry.identifiers
+        if identifier[0] == DOMAIN
+    }
+
+    devices = [
+        (hub, device)
+        for hub in loaded_hubs(hass)
+        for device in hub.devices
+        if device.serial in serials and device.is_type(device_type)
+    ]
+    if not devices:
+        raise ServiceValidationError("No PETLIBRO device matches the service target")
+    return devices
+
+
+async def _bulk_write(
+    feeders: list[tuple[PetLibroHub, Feeder]], key: str, value: Any
+) -> ServiceResponse:
+    """Send a command to each feeder concurrently and refresh the hubs once.
+
+    Commands the API cannot receive are journaled and reported as queued.
+    """
+    semaphore = Semaphore(BULK_WRITE_CONCURRENCY)
+
+    async def run(hub: PetLibroHub, feeder: Feeder) -> dict[str, Any]:
+        async with semaphore:
+            try:
+                sent = await hub.async_write(feeder, key, value, refresh=False)
+            except Exception as ex:  # pylint: disable=broad-except
+                _LOGGER.error("Unable to update %s: %s", feeder.serial, ex)
+                return {"success": False, "error": str(ex)}
+            return {"success": True, "queued": not sent}
+
+    results = await gather(*(run(hub, feeder) for hub, feeder in feeders))
+
+    for hub in {id(hub): hub for hub, _ in feeders}.values():
+        await hub.coordinator.async_request_refresh()
+
+    return {
+        "results": {
+            feeder.serial: result for (_, feeder), result in zip(feeders, results)
+        }
+    }
+
+
+def _timestamp(value: datetime | None) -> int | None:
+    """Convert a service datetime to milliseconds."""
+    if value is None:
+        return None
+    return int(dt_util.as_utc(value).timestamp() * 1000)
+
+
+async def _export(hass: HomeAssistant, device: Device, call: ServiceCall) -> str:
+    """Stream the snapshot and history of a device to an export file."""
+    export_format = call.data[ATTR_FORMAT]
+    compress = call.data[ATTR_COMPRESS]
+    name = f"{device.serial}_{dt_util.now().strftime('%Y%m%d%H%M%S')}.{export_format}"
+    output = Path(hass.config.path(EXPORT_DIR, name + (".gz" if compress else "")))
+
+    chunks = iter_chunks(
+        iter_records(
+            history_path(hass, device.serial),
+            _timestamp(call.data.get(ATTR_START)),
+            _timestamp(call.data.get(ATTR_END)),
+        ),
+        export_format,
+        dict(device._data),  # pylint: disable=protected-access
+    )
+    await hass.async_add_executor_job(write_chunks, chunks, output, compress)
+    return str(output)
+
+
+async def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the PETLIBRO services."""
+
+    async def set_feeding_plan(call: ServiceCall) -> ServiceResponse:
+        enable = call.data[ATTR_ENABLE]
+        return await _bulk_write(
+            _targeted_devices(hass, call, "Feeder"), "feeding_plan", enable
+        )
+
+    async def skip_today(call: ServiceCall) -> ServiceResponse:
+        enable = not call.data[ATTR_SKIP]
+        return await _bulk_write(
+            _targeted_devices(hass, call, "Feeder"), "feeding_plan_today_all", enable
+        )
+
+    async def export_history(call: ServiceCall) -> ServiceResponse:
+        devices = _targeted_devices(hass, call, "Device")
+        paths = await gather(*(_export(hass, device, call) for _, device in devices))
+        return {
+            "files": {
+                device.serial: path for (_, device), path in zip(devices, paths)
+            }
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_FEEDING_PLAN,
+        set_feeding_plan,
+        schema=SET_FEEDING_PLAN_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SKIP_TODAY,
+        skip_today,
+        schema=SKIP_TODAY_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_EXPORT_HISTORY,
+        export_history,
+        schema=EXPORT_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
@@ -0,0 +1,88 @@
+"""Bounded cache of PETLIBRO camera snapshots."""
+
+from __future__ import annotations
+
+from asyncio import Task, ensure_future, shield
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from functools import partial
+from time import monotonic
+
+SNAPSHOT_TTL_SECONDS = 10
+SNAPSHOT_MAX_ENTRIES = 16
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """A camera frame and the validators needed to fetch it conditionally."""
+
+    image: bytes | None
+    url: str | None = None
+    etag: str | None = None
+    last_modified: str | None = None
+    fetched_at: float = 0.0
+
+
+class SnapshotCache:
+    """LRU cache of snapshots with a TTL and shared in-flight fetches.
+
+    ``fetch`` receives the cache key and the previous snapshot, if any, so
+    it can make a conditional request and return the previous image when
+    the frame did not change.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[str, Snapshot | None], Awaitable[Snapshot]],
+        ttl: float = SNAPSHOT_TTL_SECONDS,
+        max_entries: int = SNAPSHOT_MAX_ENTRIES,
+    ) -> None:
+        """Initialize the cache."""
+        self._fetch = fetch
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, Snapshot] = OrderedDict()
+        self._inflight: dict[str, Task[Snapshot]] = {}
+
+    async def async_get(self, key: str) -> bytes | None:
+        """Return the image of a key, fetching it at most once at a time."""
+        entry = self._entries.get(key)
+        if entry is not None and monotonic() - entry.fetched_at < self.ttl:
+            self._entries.move_to_end(key)
+            return entry.image
+
+        if (task := self._inflight.get(key)) is None:
+            task = ensure_future(self._refresh(key, entry))
+            self._inflight[key] = task
+            task.add_done_callback(partial(self._forget, key))
+
+        # A viewer giving up must not cancel the fetch shared with the others
+        return (await shield(task)).image
+
+    def _forget(self, key: str, task: Task[Snapshot]) -> None:
+        """Drop a finished fetch unless a newer one replaced it."""
+        # A fetch cancelled by clear() finishes after the next one started
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+    async def _refresh(self, key: str, previous: Snapshot | None) -> Snapshot:
+        """Fetch a snapshot and store it, evicting the least recently used."""
+        snapshot = await self._fetch(key, previous)
+        self._entries[key] = snapshot
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return snapshot
+
+    def discard(self, key: str) -> None:
+        """Drop the cached snapshot of a key."""
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every cached snapshot and cancel the fetches in flight."""
+        # A fetch completing after the clear would store its snapshot again
+        for task in tuple(self._inflight.values()):
+            task.cancel()
+        self._inflight.clear()
+        self._entries.clear()
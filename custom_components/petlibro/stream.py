@@ -0,0 +1,115 @@
+"""Fan-out of a single upstream camera stream to many local consumers."""
+
+from __future__ import annotations
+
+from asyncio import CancelledError, Event, Task, TimerHandle, get_running_loop
+from collections.abc import AsyncIterator, Callable
+from logging import getLogger
+
+_LOGGER = getLogger(__name__)
+
+STREAM_BUFFER_FRAMES = 32
+STREAM_IDLE_GRACE_SECONDS = 30
+
+
+class StreamRelay:
+    """Share one upstream frame source between any number of consumers.
+
+    Frames are kept in a ring buffer indexed by a sequence number and handed
+    to consumers as the same immutable ``bytes`` objects, never copied. A
+    consumer that falls more than a buffer behind skips to the oldest frame
+    still available. The upstream is opened by the first consumer and closed
+    once none are left for ``idle_grace`` seconds.
+    """
+
+    def __init__(
+        self,
+        source: Callable[[], AsyncIterator[bytes]],
+        buffer_size: int = STREAM_BUFFER_FRAMES,
+        idle_grace: float = STREAM_IDLE_GRACE_SECONDS,
+    ) -> None:
+        """Initialize the relay with a factory of upstream frame iterators."""
+        self._source = source
+        self._buffer: list[bytes | None] = [None] * buffer_size
+        self._next_seq = 0
+        self._idle_grace = idle_grace
+        self._new_frame = Event()
+        self._consumers = 0
+        self._upstream: Task | None = None
+        self._idle_timer: TimerHandle | None = None
+        self.dropped_frames = 0
+
+    @property
+    def consumers(self) -> int:
+        """Return the number of active consumers."""
+        return self._consumers
+
+    @property
+    def is_open(self) -> bool:
+        """Return whether the upstream is open."""
+        return self._upstream is not None and not self._upstream.done()
+
+    async def _pump(self) -> None:
+        """Copy the upstream frames into the ring buffer."""
+        try:
+            async for frame in self._source():
+                self._buffer[self._next_seq % len(self._buffer)] = frame
+                self._next_seq += 1
+                self._new_frame.set()
+                self._new_frame = Event()
+        except CancelledError:
+            raise
+        except Exception as ex:  # pylint: disable=broad-except
+            _LOGGER.error("Camera stream upstream failed: %s", ex)
+        finally:
+            # Wake the consumers so they notice the end of the stream, the
+            # consumers of a reopened upstream wait on a fresh event
+            self._new_frame.set()
+            self._new_frame = Event()
+
+    def _acquire(self) -> None:
+        """Register a consumer, opening the upstream if needed."""
+        self._consumers += 1
+        if self._idle_timer is not None:
+            self._idle_timer.cancel()
+            self._idle_timer = None
+        if not self.is_open:
+            self._upstream = get_running_loop().create_task(self._pump())
+
+    def _release(self) -> None:
+        """Unregister a consumer, closing the upstream once idle."""
+        self._consumers -= 1
+        if self._consumers == 0 and self.is_open:
+            self._idle_timer = get_running_loop().call_later(
+                self._idle_grace, self.close
+            )
+
+    def close(self) -> None:
+        """Close the upstream."""
+        if self._idle_timer is not None:
+            self._idle_timer.cancel()
+            self._idle_timer = None
+        if self._upstream is not None:
+            self._upstream.cancel()
+            self._upstream = None
+
+    async def subscribe(self) -> AsyncIterator[bytes]:
+        """Yield the upstream frames, starting with the next one."""
+        self._acquire()
+        try:
+            seq = self._next_seq
+            while True:
+                if seq >= self._next_seq:
+                    if not self.is_open:
+                        return
+                    await self._new_frame.wait()
+                    continue
+                if (oldest := self._next_seq - len(self._buffer)) > seq:
+                    self.dropped_frames += oldest - seq
+                    seq = oldest
+                frame = self._buffer[seq % len(self._buffer)]
+                seq += 1
+                if frame is not None:
+                    yield frame
+        finally:
+            self._release()
@@ -2,50 +2,42 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable, Coroutine
 from dataclasses import dataclass
-from functools import cached_property
-from typing import Any, Generic
+from typing import Any
 
 from homeassistant.components.switch import SwitchEntity, SwitchEntityDescription
-from homeassistant.const import EntityCategory
+from homeassistant.const import EntityCategory, Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from . import PetLibroHubConfigEntry
-from .entity import PetLibroEntity, _DeviceT, PetLibroEntityDescription
+from .entity import DescriptionIndex, PetLibroEntity, _DeviceT, PetLibroEntityDescription
 from .devices.device import Device
-from .devices.feeders.feeder import Feeder
 
 
 @dataclass(frozen=True)
-class RequiredKeysMixin(Generic[_DeviceT]):
-    """A class that describes devices switch entity required keys."""
+class PetLibroSwitchEntityDescription(SwitchEntityDescription, PetLibroEntityDescription[_DeviceT]):
+    """A class that describes device switch entities.
 
-    set_fn: Callable[[_DeviceT, bool], Coroutine[Any, Any, None]]
-
-
-@dataclass(frozen=True)
-class PetLibroSwitchEntityDescription(SwitchEntityDescription, PetLibroEntityDescription[_DeviceT], RequiredKeysMixin[_DeviceT]):
-    """A class that describes device switch entities."""
+    The switch is set through the ``set_<key>`` method of the device.
+    """
 
     entity_category: EntityCategory = EntityCategory.CONFIG
 
 
-DEVICE_SWITCH_MAP: dict[type[Device], list[PetLibroSwitchEntityDescription]] = {
-    Feeder: [
-        PetLibroSwitchEntityDescription[Feeder](
+DEVICE_SWITCH_MAP: dict[str, list[PetLibroSwitchEntityDescription]] = {
+    "Feeder": [
+        PetLibroSwitchEntityDescription["Feeder"](
             key="feeding_plan",
             translation_key="feeding_plan",
-            set_fn=lambda device, value: device.set_feeding_plan(value)
         ),
-        PetLibroSwitchEntityDescription[Feeder](
+        PetLibroSwitchEntityDescription["Feeder"](
             key="feeding_plan_today_all",
             translation_key="feeding_plan_today_all",
-            set_fn=lambda device, value: device.set_feeding_plan_today_all(value)
         ),
     ]
 }
+DEVICE_SWITCH_DESCRIPTIONS = DescriptionIndex(DEVICE_SWITCH_MAP)
 
 
 class PetLibroSwitchEntity(PetLibroEntity[_DeviceT], SwitchEntity):
@@ -53,18 +45,18 @@ class PetLibroSwitchEntity(PetLibroEntity[_DeviceT], SwitchEntity):
 
     entity_description: PetLibroSwitchEntityDescription[_DeviceT]  # type: ignore [reportIncompatibleVariableOverride]
 
-    @cached_property
+    @property
     def is_on(self) -> bool | None:
         """Return true if switch is on."""
-        return bool(getattr(self.device, self.entity_description.key))
+        return bool(self.value)
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the switch on."""
-        await self.entity_description.set_fn(self.device, True)
+        await self.hub.async_write(self.device, self.entity_description.key, True)
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the switch off."""
-        await self.entity_description.set_fn(self.device, False)
+        await self.hub.async_write(self.device, self.entity_description.key, False)
 
 
 async def async_setup_entry(
@@ -74,11 +66,13 @@ async def async_setup_entry(
 ) -> None:
     """Set up PETLIBRO switches using config entry."""
     hub = entry.runtime_data
-    entities = [
-        PetLibroSwitchEntity(device, hub, description)
-        for device in hub.devices
-        for device_type, entity_descriptions in DEVICE_SWITCH_MAP.items()
-        if isinstance(device, device_type)
-        for description in entity_descriptions
-    ]
-    async_add_entities(entities)
+
+    def add_entities(devices: list[Device]) -> None:
+        async_add_entities(
+            PetLibroSwitchEntity(device, hub, description)
+            for device in devices
+            for description in DEVICE_SWITCH_DESCRIPTIONS.get(device)
+        )
+
+    add_entities(hub.devices)
+    entry.async_on_unload(hub.register_entity_adder(Platform.SWITCH, add_entities))
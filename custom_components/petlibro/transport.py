@@ -0,0 +1,118 @@
+"""Push transports delivering PETLIBRO device state without polling."""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+import json
+from logging import getLogger
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant, callback
+
+if TYPE_CHECKING:
+    from homeassistant.components.mqtt import ReceiveMessage
+
+_LOGGER = getLogger(__name__)
+
+# Called with the device serial and the changed data of a pushed message
+MessageCallback = Callable[[str, dict[str, Any]], None]
+# Called with whether the transport is connected
+StateCallback = Callable[[bool], None]
+
+
+class PushTransport(ABC):
+    """A source of pushed device state messages."""
+
+    def __init__(self) -> None:
+        """Initialize the transport."""
+        self._on_message: MessageCallback | None = None
+        self._on_state: StateCallback | None = None
+        self.connected = False
+
+    async def async_start(
+        self, on_message: MessageCallback, on_state: StateCallback
+    ) -> None:
+        """Start delivering messages."""
+        self._on_message = on_message
+        self._on_state = on_state
+        await self._async_connect()
+
+    async def async_stop(self) -> None:
+        """Stop delivering messages."""
+        await self._async_disconnect()
+        self._set_connected(False)
+        self._on_message = self._on_state = None
+
+    def _set_connected(self, connected: bool) -> None:
+        """Record and report the connection state."""
+        if connected != self.connected:
+            self.connected = connected
+            if self._on_state is not None:
+                self._on_state(connected)
+
+    def _deliver(self, message: dict[str, Any]) -> None:
+        """Hand a ``{"deviceSn": ..., "data": {...}}`` message to the hub."""
+        serial, data = message.get("deviceSn"), message.get("data")
+        if not isinstance(serial, str) or not isinstance(data, dict):
+            _LOGGER.debug("Ignoring malformed push message: %s", message)
+            return
+        if self._on_message is not None:
+            self._on_message(serial, data)
+
+    @abstractmethod
+    async def _async_connect(self) -> None:
+        """Connect to the message source."""
+
+    @abstractmethod
+    async def _async_disconnect(self) -> None:
+        """Disconnect from the message source."""
+
+
+class MqttTransport(PushTransport):
+    """Transport receiving device state from Home Assistant's MQTT integration.
+
+    Messages are JSON objects ``{"deviceSn": ..., "data": {...}}`` published
+    on the configured topic filter, for example by a bridge of the PETLIBRO
+    cloud broker. The transport is connected while the MQTT client is.
+    """
+
+    def __init__(self, hass: HomeAssistant, topic: str) -> None:
+        """Initialize the transport for a topic filter."""
+        super().__init__()
+        self.hass = hass
+        self.topic = topic
+        self._unsubscribes: list[Callable[[], None]] = []
+
+    async def _async_connect(self) -> None:
+        """Subscribe to the topic and follow the MQTT connection."""
+        # Only imported when push is enabled, the MQTT integration is optional
+        from homeassistant.components import mqtt  # pylint: disable=import-outside-toplevel
+
+        if not await mqtt.async_wait_for_mqtt_client(self.hass):
+            _LOGGER.error("MQTT is not available, PETLIBRO push is disabled")
+            return
+        self._unsubscribes = [
+            await mqtt.async_subscribe(self.hass, self.topic, self._message_received),
+            mqtt.async_subscribe_connection_status(self.hass, self._set_connected),
+        ]
+        self._set_connected(mqtt.is_connected(self.hass))
+
+    async def _async_disconnect(self) -> None:
+        """Unsubscribe from the topic."""
+        for unsubscribe in self._unsubscribes:
+            unsubscribe()
+        self._unsubscribes.clear()
+
+    @callback
+    def _message_received(self, message: ReceiveMessage) -> None:
+        """Decode a state message and hand it to the hub."""
+        try:
+            payload = json.loads(message.payload)
+        except ValueError:
+            _LOGGER.debug("Ignoring non JSON push message on %s", message.topic)
+            return
+        if isinstance(payload, dict):
+            self._deliver(payload)
+        else:
+            _LOGGER.debug("Ignoring malformed push message: %s", payload)
@@ -0,0 +1,214 @@
+"""Websocket API streaming the live data changes of PETLIBRO devices."""
+
+from __future__ import annotations
+
+from asyncio import TimerHandle
+from collections import deque
+from collections.abc import Callable
+from functools import partial
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+
+from .const import DOMAIN, SIGNAL_HUB_LOADED
+from .devices import Device
+from .devices.event import EVENT_DIFF
+from .hub import EVENT_DEVICES_ADDED, PetLibroHub
+from .services import loaded_hubs
+
+WS_SUBSCRIBE = f"{DOMAIN}/subscribe"
+# Changes are sent at most this often, the ones in between are coalesced
+FLUSH_INTERVAL_SECONDS = 0.5
+# Request timings kept between two flushes, the oldest are dropped
+MAX_PENDING_TIMINGS = 100
+
+
+class DiffSubscription:
+    """Stream the data diffs of the devices a client subscribed to.
+
+    Diffs are buffered and sent every FLUSH_INTERVAL_SECONDS, one message
+    per changed device. A key changing several times in between is sent
+    once with its first old and last new value, so a slow client gets fewer
+    messages instead of a growing backlog. Each message tells how many
+    changes of its device were coalesced.
+
+    Hubs loaded after the subscription, such as a reloaded entry, are
+    followed too, replacing the previous hub of their config entry.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        connection: websocket_api.ActiveConnection,
+        msg_id: int,
+        serials: set[str] | None,
+        keys: set[str] | None,
+        timings: bool,
+    ) -> None:
+        """Initialize the subscription."""
+        self.hass = hass
+        self.connection = connection
+        self.msg_id = msg_id
+        self.serials = serials
+        self.keys = keys
+        self.timings = timings
+        self._diffs: dict[str, dict[str, list[Any]]] = {}
+        self._requests: deque[dict[str, Any]] = deque(maxlen=MAX_PENDING_TIMINGS)
+        self._coalesced: dict[str, int] = {}
+        self._dropped_requests = 0
+        self._flush_handle: TimerHandle | None = None
+        # Listeners removed when the subscription closes or a hub is replaced,
+        # by config entry
+        self._unsubscribes: dict[str, list[Callable[[], None]]] = {}
+        self._unsubscribe_hubs = async_dispatcher_connect(
+            hass, SIGNAL_HUB_LOADED, self.attach_hub
+        )
+
+    @callback
+    def attach_hub(self, hub: PetLibroHub) -> None:
+        """Follow the devices of a hub, including the ones added later."""
+        self.detach_hub(hub.entry_id)
+        unsubscribes = self._unsubscribes[hub.entry_id] = []
+        self.attach_devices(unsubscribes, hub.devices)
+        unsubscribes.append(
+            hub.events.on(
+                EVENT_DEVICES_ADDED, partial(self.attach_devices, unsubscribes)
+            )
+        )
+        if self.timings:
+            listeners = hub.api.session.request_listeners
+            listeners.add(self._on_request)
+            unsubscribes.append(partial(listeners.discard, self._on_request))
+
+    def detach_hub(self, entry_id: str) -> None:
+        """Stop following the hub of a config entry."""
+        for unsubscribe in self._unsubscribes.pop(entry_id, []):
+            unsubscribe()
+
+    def attach_devices(
+        self, unsubscribes: list[Callable[[], None]], devices: list[Device]
+    ) -> None:
+        """Follow the diffs of the subscribed devices."""
+        for device in devices:
+            if self.serials is None or device.serial in self.serials:
+                unsubscribes.append(
+                    device.on(
+                        EVENT_DIFF, partial(self._on_diff, device.serial), keys=self.keys
+                    )
+                )
+
+    def close(self) -> None:
+        """Stop following the hubs and their devices."""
+        self._unsubscribe_hubs()
+        for entry_id in tuple(self._unsubscribes):
+            self.detach_hub(entry_id)
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+    def _on_diff(self, serial: str, diff: dict[str, tuple[Any, Any]]) -> None:
+        """Buffer the diff of a device."""
+        changes = self._diffs.setdefault(serial, {})
+        for key, (old, new) in diff.items():
+            if self.keys is not None and key not in self.keys:
+                continue
+            if key in changes:
+                changes[key][1] = new
+                self._coalesced[serial] = self._coalesced.get(serial, 0) + 1
+            else:
+                changes[key] = [old, new]
+        self._schedule_flush()
+
+    def _on_request(
+        self, method: str, url: str, status: int | None, elapsed: float
+    ) -> None:
+        """Buffer the timing of an API request."""
+        if len(self._requests) == self._requests.maxlen:
+            self._dropped_requests += 1
+        self._requests.append(
+            {"method": method, "url": url, "status": status, "elapsed": elapsed}
+        )
+        self._schedule_flush()
+
+    def _schedule_flush(self) -> None:
+        """Send the buffered changes at the end of the flush interval."""
+        if self._flush_handle is None:
+            self._flush_handle = self.hass.loop.call_later(
+                FLUSH_INTERVAL_SECONDS, self._flush
+            )
+
+    def _flush(self) -> None:
+        """Send the buffered changes."""
+        self._flush_handle = None
+        for serial, changes in self._diffs.items():
+            if changes := {
+                key: {"old": old, "new": new}
+                for key, (old, new) in changes.items()
+                if old != new
+            }:
+                self.connection.send_message(
+                    websocket_api.event_message(
+                        self.msg_id,
+                        {
+                            "type": "diff",
+                            "serial": serial,
+                            "changes": changes,
+                            "coalesced": self._coalesced.get(serial, 0),
+                        },
+                    )
+                )
+        if self._requests:
+            self.connection.send_message(
+                websocket_api.event_message(
+                    self.msg_id,
+                    {
+                        "type": "requests",
+                        "requests": list(self._requests),
+                        "dropped": self._dropped_requests,
+                    },
+                )
+            )
+        self._diffs.clear()
+        self._requests.clear()
+        self._coalesced.clear()
+        self._dropped_requests = 0
+
+
+@websocket_api.require_admin
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): WS_SUBSCRIBE,
+        vol.Optional("serials"): [str],
+        vol.Optional("keys"): [str],
+        vol.Optional("timings", default=False): bool,
+    }
+)
+@callback
+def ws_subscribe(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Subscribe to the data diffs of PETLIBRO devices."""
+    subscription = DiffSubscription(
+        hass,
+        connection,
+        msg["id"],
+        set(msg["serials"]) if "serials" in msg else None,
+        set(msg["keys"]) if "keys" in msg else None,
+        msg["timings"],
+    )
+    for hub in loaded_hubs(hass):
+        subscription.attach_hub(hub)
+    connection.subscriptions[msg["id"]] = subscription.close
+    connection.send_result(msg["id"])
+
+
+@callback
+def async_setup_websocket_api(hass: HomeAssistant) -> None:
+    """Register the PETLIBRO websocket commands."""
+    websocket_api.async_register_command(hass, ws_subscribe)
@@ -0,0 +1,191 @@
+"""Local stand-ins of the PETLIBRO cloud for the tests."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from types import SimpleNamespace
+from typing import Any
+
+from custom_components.petlibro.endpoints import EndpointSelector
+from custom_components.petlibro.transport import PushTransport
+
+FEEDER_SERIAL = "FEEDER0001"
+FOUNTAIN_SERIAL = "FOUNTAIN0001"
+CAMERA_FEEDER_SERIAL = "CAMERA0001"
+
+
+def feeder_data(serial: str = FEEDER_SERIAL) -> dict[str, Any]:
+    """Return the device list entry of a Granary Feeder."""
+    return {
+        "deviceSn": serial,
+        "productName": "Granary Feeder",
+        "productIdentifier": "PLAF103",
+        "name": "Feeder",
+        "mac": "00:11:22:33:44:55",
+        "online": True,
+    }
+
+
+def camera_feeder_data(serial: str = CAMERA_FEEDER_SERIAL) -> dict[str, Any]:
+    """Return the device list entry of a Granary Camera Feeder."""
+    return {
+        "deviceSn": serial,
+        "productName": "Granary Camera Feeder",
+        "productIdentifier": "PLAF203",
+        "name": "Camera Feeder",
+        "mac": "CC:DD:EE:FF:00:11",
+        "online": True,
+    }
+
+
+def fountain_data(serial: str = FOUNTAIN_SERIAL) -> dict[str, Any]:
+    """Return the device list entry of a Dockstream Smart Fountain."""
+    return {
+        "deviceSn": serial,
+        "productName": "Dockstream Smart Fountain",
+        "productIdentifier": "PLWF105",
+        "name": "Fountain",
+        "mac": "66:77:88:99:AA:BB",
+        "online": True,
+    }
+
+
+class FakePetLibroAPI:
+    """In-memory stand-in for PetLibroAPI, counting the calls it serves."""
+
+    def __init__(self, devices: list[dict[str, Any]] | None = None) -> None:
+        """Initialize the API with the device list entries of the account."""
+        self.devices = {
+            device["deviceSn"]: device
+            for device in devices or [feeder_data(), fountain_data()]
+        }
+        self.real_info: dict[str, dict[str, Any]] = {
+            serial: {
+                "unitType": 1,
+                "enableFeedingPlan": True,
+                "remainingDesiccantDays": 10,
+                "weightPercent": 80,
+                "weight": 1500,
+                "todayTotalMl": 100,
+                "remainingCleaningDays": 5,
+                "remainingReplacementDays": 20,
+            }
+            for serial in self.devices
+        }
+        # Cleared to hold the picture requests until it is set again
+        self.picture_gate = asyncio.Event()
+        self.picture_gate.set()
+        # Raised by the device reads and writes when set
+        self.read_error: Exception | None = None
+        self.write_error: Exception | None = None
+        self.writes: list[tuple[str, str, Any]] = []
+        self.work_records: dict[str, list[dict[str, Any]]] = {}
+        self.calls: Counter[str] = Counter()
+        self.session = SimpleNamespace(
+            endpoints=EndpointSelector(["http://petlibro.invalid"]),
+            request_listeners=set(),
+        )
+
+    async def login(self, email: str, password: str) -> str:
+        """Return a new token."""
+        self.calls["login"] += 1
+        return "new-token"
+
+    async def list_devices(self) -> list[dict[str, Any]]:
+        """Return the device list."""
+        self.calls["list_devices"] += 1
+        return [dict(device) for device in self.devices.values()]
+
+    async def device_base_info(self, serial: str) -> dict[str, Any]:
+        """Return the base info of a device."""
+        self.calls["device_base_info"] += 1
+        return {"softwareVersion": "1.0.0", "hardwareVersion": "1.0"}
+
+    async def device_real_info(self, serial: str) -> dict[str, Any]:
+        """Return the real time info of a device."""
+        self.calls["device_real_info"] += 1
+        if self.read_error is not None:
+            raise self.read_error
+        return dict(self.real_info[serial])
+
+    async def device_grain_status(self, serial: str) -> dict[str, Any]:
+        """Return the grain status of a feeder."""
+        self.calls["device_grain_status"] += 1
+        return {"todayFeedingQuantity": 4, "todayFeedingTimes": 2}
+
+    async def device_feeding_plan_today_new(self, serial: str) -> dict[str, Any]:
+        """Return today's feeding plan of a feeder."""
+        self.calls["device_feeding_plan_today_new"] += 1
+        return {"allSkipped": False, "plans": []}
+
+    async def device_last_picture(self, serial: str) -> str | None:
+        """Return no picture, once the picture gate is open."""
+        await self.picture_gate.wait()
+        return None
+
+    async def device_work_records(
+        self, serial: str, start: int, end: int, types: list[str], size: int = 50
+    ) -> list[dict[str, Any]]:
+        """Return a page of the work records of a time range, newest first."""
+        self.calls["device_work_records"] += 1
+        records = [
+            record
+            for record in self.work_records.get(serial, [])
+            if start <= record["recordTime"] <= end and record["type"] in types
+        ]
+        records.sort(key=lambda record: record["recordTime"], reverse=True)
+        return [{"workRecords": records[:size]}]
+
+    async def set_device_feeding_plan(self, serial: str, enable: bool) -> None:
+        """Record a feeding plan change."""
+        if self.write_error is not None:
+            raise self.write_error
+        self.writes.append((serial, "feeding_plan", enable))
+
+    async def set_device_feeding_plan_today_all(self, serial: str, enable: bool) -> None:
+        """Record a skip of today's meals."""
+        if self.write_error is not None:
+            raise self.write_error
+        self.writes.append((serial, "feeding_plan_today_all", enable))
+
+    async def probe_endpoints(self) -> str:
+        """Return the only endpoint."""
+        return self.session.endpoints.current
+
+
+class LocalBroker:
+    """In-process stand-in for the cloud broker."""
+
+    def __init__(self) -> None:
+        """Initialize the broker."""
+        self.transports: set[LocalBrokerTransport] = set()
+
+    def publish(self, serial: str, data: dict[str, Any]) -> None:
+        """Publish a device state message to every connected transport."""
+        for transport in tuple(self.transports):
+            transport._deliver({"deviceSn": serial, "data": data})  # pylint: disable=protected-access
+
+    def drop_connections(self) -> None:
+        """Simulate a broker outage."""
+        for transport in tuple(self.transports):
+            transport._set_connected(False)  # pylint: disable=protected-access
+        self.transports.clear()
+
+
+class LocalBrokerTransport(PushTransport):
+    """Transport receiving messages from a LocalBroker."""
+
+    def __init__(self, broker: LocalBroker) -> None:
+        """Initialize the transport."""
+        super().__init__()
+        self.broker = broker
+
+    async def _async_connect(self) -> None:
+        """Subscribe to the broker."""
+        self.broker.transports.add(self)
+        self._set_connected(True)
+
+    async def _async_disconnect(self) -> None:
+        """Unsubscribe from the broker."""
+        self.broker.transports.discard(self)
@@ -0,0 +1,81 @@
+"""Tests for the fleet aggregates, against a fake API."""
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from homeassistant.const import CONF_API_TOKEN, CONF_REGION  # noqa: E402
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from custom_components.petlibro.hub import PetLibroHub  # noqa: E402
+
+from .common import FEEDER_SERIAL, FakePetLibroAPI, feeder_data  # noqa: E402
+
+pytestmark = pytest.mark.asyncio
+
+OTHER_FEEDER_SERIAL = "FEEDER0002"
+
+
+async def test_feeding_total_only_sums_one_unit(hass: HomeAssistant) -> None:
+    """Feeders in another unit than the first one are left out of the total."""
+    hub = PetLibroHub(hass, "entry", {CONF_REGION: "US", CONF_API_TOKEN: "token"})
+    hub.api = FakePetLibroAPI([feeder_data(), feeder_data(OTHER_FEEDER_SERIAL)])
+    hub.api.real_info[OTHER_FEEDER_SERIAL]["unitType"] = 3
+    await hub.load_devices()
+
+    first = await hub.get_device(FEEDER_SERIAL)
+    other = await hub.get_device(OTHER_FEEDER_SERIAL)
+    assert hub.aggregates.units["total_feeding_quantity"] == "cup"
+    assert hub.aggregates.values["total_feeding_quantity"] == pytest.approx(
+        first.today_feeding_quantity
+    )
+
+    other.update_data({"unitType": 1})
+    assert hub.aggregates.values["total_feeding_quantity"] == pytest.approx(
+        first.today_feeding_quantity + other.today_feeding_quantity
+    )
+
+    await hub.async_shutdown()
+
+
+async def test_feeding_unit_is_pinned_again(hass: HomeAssistant) -> None:
+    """A feeder without a unit pins nothing, the unit follows a leaving feeder."""
+    hub = PetLibroHub(hass, "entry", {CONF_REGION: "US", CONF_API_TOKEN: "token"})
+    hub.api = FakePetLibroAPI([feeder_data(), feeder_data(OTHER_FEEDER_SERIAL)])
+    hub.api.real_info[FEEDER_SERIAL]["unitType"] = None
+    hub.api.real_info[OTHER_FEEDER_SERIAL]["unitType"] = 3
+    await hub.load_devices()
+
+    first = await hub.get_device(FEEDER_SERIAL)
+    other = await hub.get_device(OTHER_FEEDER_SERIAL)
+    assert hub.aggregates.units["total_feeding_quantity"] == "g"
+    assert hub.aggregates.values["total_feeding_quantity"] == pytest.approx(
+        other.today_feeding_quantity
+    )
+
+    first.update_data({"unitType": 1})
+    hub._remove_device(other)  # pylint: disable=protected-access
+    assert hub.aggregates.units["total_feeding_quantity"] == "cup"
+    assert hub.aggregates.values["total_feeding_quantity"] == pytest.approx(
+        first.today_feeding_quantity
+    )
+
+    await hub.async_shutdown()
+
+
+async def test_feeding_total_does_not_drift(hass: HomeAssistant) -> None:
+    """Converted quantities leave no float residue once they are all removed."""
+    hub = PetLibroHub(hass, "entry", {CONF_REGION: "US", CONF_API_TOKEN: "token"})
+    hub.api = FakePetLibroAPI([feeder_data(), feeder_data(OTHER_FEEDER_SERIAL)])
+    await hub.load_devices()
+
+    first = await hub.get_device(FEEDER_SERIAL)
+    other = await hub.get_device(OTHER_FEEDER_SERIAL)
+    for quantity in range(1, 40):
+        first.update_data({"grainStatus": {"todayFeedingQuantity": quantity}})
+        other.update_data({"grainStatus": {"todayFeedingQuantity": quantity + 7}})
+    first.update_data({"grainStatus": {"todayFeedingQuantity": 0}})
+    other.update_data({"grainStatus": {"todayFeedingQuantity": 0}})
+    assert hub.aggregates.values["total_feeding_quantity"] == 0.0
+
+    await hub.async_shutdown()
@@ -0,0 +1,90 @@
+"""Tests for the reloads of a config entry."""
+
+from unittest.mock import patch
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from homeassistant.config_entries import ConfigEntryState  # noqa: E402
+from homeassistant.const import (  # noqa: E402
+    CONF_API_TOKEN,
+    CONF_EMAIL,
+    CONF_PASSWORD,
+    CONF_REGION,
+)
+from homeassistant.core import HomeAssistant  # noqa: E402
+from pytest_homeassistant_custom_component.common import MockConfigEntry  # noqa: E402
+
+from custom_components.petlibro.const import CONF_LOW_WATER_LEVEL, DOMAIN  # noqa: E402
+
+from .common import FakePetLibroAPI  # noqa: E402
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture
+def apis():
+    """Patch the API with fakes, yielding the fakes created."""
+    created: list[FakePetLibroAPI] = []
+
+    def _fake_api(*_, **__) -> FakePetLibroAPI:
+        created.append(api := FakePetLibroAPI())
+        return api
+
+    with (
+        patch("custom_components.petlibro.hub.PetLibroAPI", _fake_api),
+        patch("custom_components.petlibro.config_flow.PetLibroAPI", _fake_api),
+    ):
+        yield created
+
+
+async def _setup_entry(hass: HomeAssistant) -> MockConfigEntry:
+    """Add and set up a config entry."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_EMAIL: "user@example.com",
+            CONF_REGION: "US",
+            CONF_API_TOKEN: "token",
+        },
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry
+
+
+async def test_reauth_reloads_once(hass: HomeAssistant, apis) -> None:
+    """Storing the new token does not reload the entry a second time."""
+    entry = await _setup_entry(hass)
+    hubs = len(apis)
+
+    result = await entry.start_reauth_flow(hass)
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {CONF_PASSWORD: "password"}
+    )
+    await hass.async_block_till_done()
+
+    assert result["reason"] == "reauth_successful"
+    assert entry.data[CONF_API_TOKEN] == "new-token"
+    assert entry.state is ConfigEntryState.LOADED
+    # One API for the login, one for the reloaded hub
+    assert len(apis) == hubs + 2
+    assert entry.runtime_data.api is apis[-1]
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_options_change_reloads(hass: HomeAssistant, apis) -> None:
+    """Changing the options reloads the entry with them."""
+    entry = await _setup_entry(hass)
+    hub = entry.runtime_data
+
+    hass.config_entries.async_update_entry(entry, options={CONF_LOW_WATER_LEVEL: 5})
+    await hass.async_block_till_done()
+
+    assert entry.runtime_data is not hub
+    assert entry.runtime_data.options == {CONF_LOW_WATER_LEVEL: 5}
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
@@ -0,0 +1,135 @@
+"""Tests for endpoint selection, against local stand-in API servers."""
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import AsyncExitStack, asynccontextmanager
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from aiohttp import ClientError, ClientSession, web  # noqa: E402
+from aiohttp.test_utils import TestServer  # noqa: E402
+
+from custom_components.petlibro.api import PetLibroAPI  # noqa: E402
+from custom_components.petlibro.endpoints import FAILURE_THRESHOLD  # noqa: E402
+from custom_components.petlibro.exceptions import PetLibroAPIError  # noqa: E402
+
+# The stand-in servers listen on local sockets
+pytestmark = [pytest.mark.asyncio, pytest.mark.usefixtures("socket_enabled")]
+
+
+class StandInServer:
+    """A local PETLIBRO API with an injected latency and status."""
+
+    def __init__(self, latency: float) -> None:
+        """Initialize the server."""
+        self.latency = latency
+        self.status = 200
+        self.requests = 0
+        app = web.Application()
+        app.router.add_post("/device/device/list", self._list_devices)
+        self.server = TestServer(app)
+
+    @property
+    def url(self) -> str:
+        """Return the base URL of the server."""
+        return str(self.server.make_url("/"))
+
+    async def _list_devices(self, request: web.Request) -> web.Response:
+        """Answer the device list after the injected latency."""
+        self.requests += 1
+        await asyncio.sleep(self.latency)
+        if self.status != 200:
+            return web.Response(status=self.status)
+        return web.json_response({"code": 0, "data": []})
+
+
+@asynccontextmanager
+async def stand_in_api(
+    *latencies: float,
+) -> AsyncIterator[tuple[PetLibroAPI, list[StandInServer]]]:
+    """Run a stand-in server per latency and an API using them in order."""
+    async with AsyncExitStack() as stack:
+        servers = [StandInServer(latency) for latency in latencies]
+        for server in servers:
+            await server.server.start_server()
+            stack.push_async_callback(server.server.close)
+        websession = await stack.enter_async_context(ClientSession())
+        yield (
+            PetLibroAPI(
+                websession, "UTC", "US", "token", [server.url for server in servers]
+            ),
+            servers,
+        )
+
+
+async def test_probe_selects_fastest_endpoint() -> None:
+    """Probing measures every endpoint and switches to the fastest."""
+    async with stand_in_api(0.15, 0.0, 0.05) as (api, servers):
+        assert api.session.endpoints.current == servers[0].url
+
+        assert await api.probe_endpoints() == servers[1].url
+        assert all(server.requests == 1 for server in servers)
+
+        await api.list_devices()
+        assert servers[1].requests == 2
+
+
+async def test_probe_skips_failing_endpoint() -> None:
+    """An endpoint failing its probe is not selected, however fast."""
+    async with stand_in_api(0.0, 0.05) as (api, servers):
+        servers[0].status = 503
+
+        assert await api.probe_endpoints() == servers[1].url
+        assert not api.session.endpoints.stats[servers[0].url].healthy
+
+
+async def test_failover_on_server_errors() -> None:
+    """Requests move to another endpoint once the current one keeps failing."""
+    async with stand_in_api(0.0, 0.05) as (api, servers):
+        servers[0].status = 503
+
+        for _ in range(FAILURE_THRESHOLD):
+            with pytest.raises(PetLibroAPIError):
+                await api.list_devices()
+        assert api.session.endpoints.current == servers[1].url
+
+        assert await api.list_devices() == []
+        assert servers[0].requests == FAILURE_THRESHOLD
+        assert servers[1].requests == 1
+
+
+async def test_failover_on_connection_errors() -> None:
+    """An unreachable endpoint is failed over, and everything down is reported."""
+    async with stand_in_api(0.0, 0.0) as (api, servers):
+        await servers[0].server.close()
+
+        for _ in range(FAILURE_THRESHOLD):
+            with pytest.raises(ClientError):
+                await api.list_devices()
+        assert api.session.endpoints.current == servers[1].url
+        assert api.session.endpoints.available
+
+        await servers[1].server.close()
+        for _ in range(FAILURE_THRESHOLD):
+            with pytest.raises(ClientError):
+                await api.list_devices()
+        assert not api.session.endpoints.available
+
+
+async def test_request_listeners_see_latency() -> None:
+    """Request listeners receive the status and duration of every request."""
+    async with stand_in_api(0.05) as (api, servers):
+        seen = []
+        api.session.request_listeners.add(
+            lambda method, url, status, duration: seen.append((status, duration))
+        )
+        servers[0].status = 503
+        with pytest.raises(PetLibroAPIError):
+            await api.list_devices()
+        servers[0].status = 200
+        await api.list_devices()
+
+        assert [status for status, _ in seen] == [503, 200]
+        assert all(duration >= 0.05 for _, duration in seen)
@@ -0,0 +1,38 @@
+"""Tests for the catalog fetch plans, against a fake API."""
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.petlibro.devices import product_name_map  # noqa: E402
+
+from .common import FEEDER_SERIAL, FakePetLibroAPI, feeder_data  # noqa: E402
+
+pytestmark = pytest.mark.asyncio
+
+PLAN_FETCH = "device_feeding_plan_today_new"
+
+
+async def test_feeding_plan_fetched_only_when_outdated() -> None:
+    """The feeding plan step only runs when the plan may have changed."""
+    api = FakePetLibroAPI([feeder_data()])
+    product = product_name_map["Granary Feeder"]
+    device = product.create(feeder_data(), api)
+
+    await device.refresh()
+    assert api.calls[PLAN_FETCH] == 1
+    assert device.feeding_plan_today_all
+
+    await device.refresh()
+    assert api.calls[PLAN_FETCH] == 1
+    assert api.calls["device_grain_status"] == 2
+
+    # Turning the plan off elsewhere makes the fetched plan outdated
+    api.real_info[FEEDER_SERIAL]["enableFeedingPlan"] = False
+    await device.refresh()
+    assert api.calls[PLAN_FETCH] == 2
+
+    # A local guess after a write does not count as a fetched plan
+    await device.set_feeding_plan_today_all(False, refresh=False)
+    await device.refresh()
+    assert api.calls[PLAN_FETCH] == 3
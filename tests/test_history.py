@@ -0,0 +1,92 @@
+"""Tests for the history sync, against a fake API."""
+
+from pathlib import Path
+from time import time
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from homeassistant.const import CONF_API_TOKEN, CONF_REGION  # noqa: E402
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from custom_components.petlibro.history import (  # noqa: E402
+    HISTORY_MAX_PAGES,
+    HISTORY_PAGE_SIZE,
+    PetLibroHistory,
+    history_path,
+)
+from custom_components.petlibro.hub import PetLibroHub  # noqa: E402
+
+from .common import FOUNTAIN_SERIAL, FakePetLibroAPI, fountain_data  # noqa: E402
+
+pytestmark = pytest.mark.asyncio
+
+DAY_MS = 86_400_000
+
+
+def _drinks(start: int, count: int, step: int) -> list[dict]:
+    """Return drinking records every step milliseconds from start."""
+    return [
+        {
+            "id": index,
+            "recordTime": start + index * step,
+            "type": "DRINK_WATER",
+            "drinkWaterMl": 10,
+        }
+        for index in range(count)
+    ]
+
+
+@pytest.fixture
+async def hub(hass: HomeAssistant, tmp_path: Path) -> PetLibroHub:
+    """Return a hub loaded from the fake API, storing under a temporary dir."""
+    hass.config.config_dir = str(tmp_path)
+    hub = PetLibroHub(hass, "entry", {CONF_REGION: "US", CONF_API_TOKEN: "token"})
+    hub.api = FakePetLibroAPI([fountain_data()])
+    await hub.load_devices()
+    yield hub
+    await hub.async_shutdown()
+
+
+def _stored_times(hass: HomeAssistant) -> list[int]:
+    """Return the times of the records stored for the fountain."""
+    path = history_path(hass, FOUNTAIN_SERIAL)
+    return [
+        int(line.split('"time":')[1].split(",")[0])
+        for line in path.read_text().splitlines()
+    ]
+
+
+async def test_dense_period_is_synced_in_smaller_windows(
+    hass: HomeAssistant, hub: PetLibroHub
+) -> None:
+    """More records than a window can page through are all stored."""
+    count = HISTORY_MAX_PAGES * HISTORY_PAGE_SIZE + 200
+    start = int(time() * 1000) - DAY_MS
+    hub.api.work_records[FOUNTAIN_SERIAL] = records = _drinks(start, count, 1000)
+
+    history = PetLibroHistory(hass, hub)
+    await history.async_sync(await hub.get_device(FOUNTAIN_SERIAL))
+
+    assert _stored_times(hass) == [record["recordTime"] for record in records]
+
+
+async def test_long_downtime_always_makes_progress(
+    hass: HomeAssistant, hub: PetLibroHub
+) -> None:
+    """A sync after a long downtime stores everything, oldest first."""
+    now = int(time() * 1000)
+    hub.api.work_records[FOUNTAIN_SERIAL] = _drinks(now - 6 * DAY_MS, 600, 800_000)
+    device = await hub.get_device(FOUNTAIN_SERIAL)
+    history = PetLibroHistory(hass, hub)
+    await history.async_sync(device)
+    stored = _stored_times(hass)
+    assert len(stored) == 600
+    assert stored == sorted(stored)
+
+    # Nothing new: the next sync only asks for what came after the cursor
+    calls = hub.api.calls["device_work_records"]
+    await history.async_sync(device)
+    assert hub.api.calls["device_work_records"] == calls + 1
+    assert len(_stored_times(hass)) == 600
@@ -0,0 +1,94 @@
+"""Tests for the journaling of device commands, against a fake API."""
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from homeassistant.const import CONF_API_TOKEN, CONF_REGION  # noqa: E402
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from custom_components.petlibro.exceptions import (  # noqa: E402
+    PetLibroAPIError,
+    PetLibroInvalidAuth,
+    PetLibroServerError,
+)
+from custom_components.petlibro.hub import PetLibroHub  # noqa: E402
+
+from .common import FEEDER_SERIAL, FakePetLibroAPI, feeder_data  # noqa: E402
+
+pytestmark = pytest.mark.asyncio
+
+
+async def _hub(hass: HomeAssistant) -> PetLibroHub:
+    """Return a hub loaded from the fake API."""
+    hub = PetLibroHub(hass, "entry", {CONF_REGION: "US", CONF_API_TOKEN: "token"})
+    hub.api = FakePetLibroAPI([feeder_data()])
+    await hub.load_devices()
+    return hub
+
+
+async def test_server_error_journals_command(hass: HomeAssistant) -> None:
+    """A write failing with a server error is queued for later."""
+    hub = await _hub(hass)
+    device = await hub.get_device(FEEDER_SERIAL)
+    hub.api.write_error = PetLibroServerError("Server error: 503")
+
+    assert not await hub.async_write(device, "feeding_plan", False)
+    assert hub.journal.depth == 1
+
+    hub.api.write_error = None
+    await hub.journal.async_replay()
+    assert hub.journal.depth == 0
+    assert hub.api.writes == [(FEEDER_SERIAL, "feeding_plan", False)]
+    await hub.async_shutdown()
+
+
+async def test_failed_refresh_after_write_is_not_journaled(
+    hass: HomeAssistant,
+) -> None:
+    """A command sent once is never queued again because its refresh failed."""
+    hub = await _hub(hass)
+    device = await hub.get_device(FEEDER_SERIAL)
+    hub.api.read_error = PetLibroServerError("Server error: 502")
+
+    assert await hub.async_write(device, "feeding_plan", False)
+    assert hub.journal.depth == 0
+    assert hub.api.writes == [(FEEDER_SERIAL, "feeding_plan", False)]
+    assert device.feeding_plan is False
+    await hub.async_shutdown()
+
+
+@pytest.mark.parametrize(
+    ("error", "kept"),
+    [
+        (PetLibroServerError("Server error: 500"), True),
+        (RuntimeError("Unexpected"), True),
+        (PetLibroInvalidAuth(), True),
+        (PetLibroAPIError("Code: 1, Message: Invalid value"), False),
+    ],
+)
+async def test_replay_only_drops_rejected_commands(
+    hass: HomeAssistant, error: Exception, kept: bool
+) -> None:
+    """Replay keeps the commands it may send later, and drops rejected ones."""
+    hub = await _hub(hass)
+    await hub.journal.async_enqueue(FEEDER_SERIAL, "feeding_plan", False)
+    hub.api.write_error = error
+
+    await hub.journal.async_replay()
+    assert hub.journal.has_pending(FEEDER_SERIAL) is kept
+    await hub.async_shutdown()
+
+
+async def test_replay_drops_commands_of_a_past_day(hass: HomeAssistant) -> None:
+    """Skipping today's meals is not replayed on another day."""
+    hub = await _hub(hass)
+    await hub.journal.async_enqueue(FEEDER_SERIAL, "feeding_plan_today_all", False)
+    await hub.journal.async_enqueue(FEEDER_SERIAL, "feeding_plan", False)
+    for entry in hub.journal.entries.values():
+        entry.queued_at -= 86_400
+
+    await hub.journal.async_replay()
+    assert hub.journal.depth == 0
+    assert hub.api.writes == [(FEEDER_SERIAL, "feeding_plan", False)]
+    await hub.async_shutdown()
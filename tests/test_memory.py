@@ -0,0 +1,119 @@
+"""Memory harness: repeated setup and unload must not leave anything behind."""
+
+import asyncio
+import gc
+import tracemalloc
+from unittest.mock import patch
+import weakref
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from homeassistant.const import (  # noqa: E402
+    CONF_API_TOKEN,
+    CONF_REGION,
+    EVENT_HOMEASSISTANT_FINAL_WRITE,
+)
+from homeassistant.core import HomeAssistant  # noqa: E402
+from pytest_homeassistant_custom_component.common import MockConfigEntry  # noqa: E402
+
+from custom_components.petlibro.const import DOMAIN  # noqa: E402
+
+from .common import (  # noqa: E402
+    CAMERA_FEEDER_SERIAL,
+    FakePetLibroAPI,
+    camera_feeder_data,
+    feeder_data,
+    fountain_data,
+)
+
+pytestmark = pytest.mark.asyncio
+
+ROUNDS = 5
+# Allocations allowed to remain after the first round, for caches and logs
+MAX_GROWTH_BYTES = 512 * 1024
+
+
+def _fake_api(*_, **__) -> FakePetLibroAPI:
+    """Return a fresh fake API for a hub."""
+    return FakePetLibroAPI([feeder_data(), camera_feeder_data(), fountain_data()])
+
+
+async def _setup_and_unload(
+    hass: HomeAssistant, entry: MockConfigEntry
+) -> tuple[weakref.ref, weakref.ref]:
+    """Set up the entry, leave a camera stream busy, then unload it.
+
+    :return: Weak references to the hub and the camera stream relay
+    """
+    with patch("custom_components.petlibro.hub.PetLibroAPI", _fake_api):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    hub = entry.runtime_data
+
+    # A viewer leaves while the snapshot fetch is held: the relay stays open
+    # with its idle timer armed and the fetch in flight
+    hub.api.picture_gate.clear()
+    relay = hub.stream_relay(CAMERA_FEEDER_SERIAL)
+    frames = relay.subscribe()
+    viewer = asyncio.ensure_future(anext(frames))
+    await asyncio.sleep(0.01)
+    viewer.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await viewer
+    idle_timer = relay._idle_timer  # pylint: disable=protected-access
+    fetches = list(hub.snapshots._inflight.values())  # pylint: disable=protected-access
+    assert idle_timer is not None
+    assert fetches
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+    # Let the done callbacks of the cancelled tasks run, they hold the tasks
+    await asyncio.sleep(0)
+
+    assert idle_timer.cancelled()
+    assert all(fetch.done() for fetch in fetches)
+    assert not hub.streams
+    refs = weakref.ref(hub), weakref.ref(relay)
+    del hub, relay, frames, viewer, fetches
+    return refs
+
+
+def _listener_counts(hass: HomeAssistant) -> dict[str, int]:
+    """Return the number of listeners of every event type.
+
+    Final write listeners come and go with the delayed saves of the core
+    registries, the integration's stores never delay their saves.
+    """
+    counts = dict(hass.bus.async_listeners())
+    counts.pop(EVENT_HOMEASSISTANT_FINAL_WRITE, None)
+    return counts
+
+
+async def test_repeated_setup_unload_releases_everything(hass: HomeAssistant) -> None:
+    """No hub, relay or listener survives an unload, and memory stays flat."""
+    entry = MockConfigEntry(
+        domain=DOMAIN, data={CONF_REGION: "US", CONF_API_TOKEN: "token"}
+    )
+    entry.add_to_hass(hass)
+
+    tracemalloc.start()
+    try:
+        # The first round sets the integration itself up, it is the baseline
+        refs = [await _setup_and_unload(hass, entry)]
+        gc.collect()
+        listeners = _listener_counts(hass)
+        baseline, _ = tracemalloc.get_traced_memory()
+
+        for _ in range(ROUNDS - 1):
+            refs.append(await _setup_and_unload(hass, entry))
+            gc.collect()
+            assert _listener_counts(hass) == listeners
+
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert [ref() for pair in refs for ref in pair] == [None] * 2 * ROUNDS
+    assert current - baseline < MAX_GROWTH_BYTES
@@ -0,0 +1,88 @@
+"""Tests for push updates, against a local broker and a fake API."""
+
+from datetime import timedelta
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from homeassistant.const import CONF_API_TOKEN, CONF_REGION  # noqa: E402
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from custom_components.petlibro.hub import (  # noqa: E402
+    PUSH_UPDATE_INTERVAL_SECONDS,
+    UPDATE_INTERVAL_SECONDS,
+    PetLibroHub,
+)
+
+from .common import (  # noqa: E402
+    FEEDER_SERIAL,
+    FakePetLibroAPI,
+    LocalBroker,
+    LocalBrokerTransport,
+)
+
+pytestmark = pytest.mark.asyncio
+
+
+async def _hub(hass: HomeAssistant) -> PetLibroHub:
+    """Return a hub loaded from the fake API."""
+    hub = PetLibroHub(hass, "entry", {CONF_REGION: "US", CONF_API_TOKEN: "token"})
+    hub.api = FakePetLibroAPI()
+    await hub.load_devices()
+    return hub
+
+
+async def test_push_updates_devices(hass: HomeAssistant) -> None:
+    """Pushed messages update devices and slow polling down."""
+    hub = await _hub(hass)
+    broker = LocalBroker()
+    await hub.async_start_push(LocalBrokerTransport(broker))
+    assert hub.coordinator.update_interval == timedelta(
+        seconds=PUSH_UPDATE_INTERVAL_SECONDS
+    )
+
+    device = await hub.get_device(FEEDER_SERIAL)
+    broker.publish(FEEDER_SERIAL, {"remainingDesiccantDays": 3})
+    assert device.remaining_desiccant == 3
+
+    broker.publish("UNKNOWN", {"remainingDesiccantDays": 1})
+    assert device.remaining_desiccant == 3
+
+    await hub.async_shutdown()
+    assert not broker.transports
+
+
+async def test_push_outage_falls_back_to_polling(hass: HomeAssistant) -> None:
+    """Polling resumes at its regular interval when the broker drops."""
+    hub = await _hub(hass)
+    broker = LocalBroker()
+    await hub.async_start_push(LocalBrokerTransport(broker))
+    calls = hub.api.calls["list_devices"]
+
+    broker.drop_connections()
+    assert hub.coordinator.update_interval == timedelta(seconds=UPDATE_INTERVAL_SECONDS)
+    await hass.async_block_till_done()
+    # The refresh catching up on the outage lists the devices again
+    assert hub.api.calls["list_devices"] > calls
+
+    broker.publish(FEEDER_SERIAL, {"remainingDesiccantDays": 3})
+    assert (await hub.get_device(FEEDER_SERIAL)).remaining_desiccant != 3
+
+    await hub.async_shutdown()
+
+
+async def test_stop_push_restores_polling(hass: HomeAssistant) -> None:
+    """Stopping push goes back to regular polling without a catch up refresh."""
+    hub = await _hub(hass)
+    broker = LocalBroker()
+    await hub.async_start_push(LocalBrokerTransport(broker))
+    calls = hub.api.calls["list_devices"]
+
+    await hub.async_stop_push()
+    await hass.async_block_till_done()
+    assert hub.coordinator.update_interval == timedelta(seconds=UPDATE_INTERVAL_SECONDS)
+    assert hub.api.calls["list_devices"] == calls
+    assert not broker.transports
+
+    await hub.async_shutdown()
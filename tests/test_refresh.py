@@ -0,0 +1,67 @@
+"""Tests for the list-driven refresh cycles, against a fake API."""
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from homeassistant.const import CONF_API_TOKEN, CONF_REGION  # noqa: E402
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from custom_components.petlibro.hub import (  # noqa: E402
+    DETAIL_MAX_AGE_SECONDS,
+    UPDATE_INTERVAL_SECONDS,
+    PetLibroHub,
+)
+
+from .common import FEEDER_SERIAL, FOUNTAIN_SERIAL, FakePetLibroAPI  # noqa: E402
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_cycle_only_refreshes_changed_devices(hass: HomeAssistant) -> None:
+    """Unchanged devices cost no request beyond the device list."""
+    hub = PetLibroHub(hass, "entry", {CONF_REGION: "US", CONF_API_TOKEN: "token"})
+    hub.api = api = FakePetLibroAPI()
+    await hub.load_devices()
+
+    # A polling interval later
+    for state in hub.refresh_states.values():
+        state.refreshed_at -= UPDATE_INTERVAL_SECONDS
+    api.calls.clear()
+    await hub.refresh_devices()
+    assert api.calls == {"list_devices": 1}
+
+    api.devices[FOUNTAIN_SERIAL]["name"] = "Kitchen fountain"
+    api.calls.clear()
+    await hub.refresh_devices()
+    assert api.calls["list_devices"] == 1
+    assert api.calls["device_real_info"] == 1
+    assert api.calls["device_grain_status"] == 0
+
+    # Details only found in the detailed calls are refreshed once too old
+    hub.refresh_states[FEEDER_SERIAL].refreshed_at -= DETAIL_MAX_AGE_SECONDS
+    api.calls.clear()
+    await hub.refresh_devices()
+    assert api.calls["device_real_info"] == 1
+    assert api.calls["device_grain_status"] == 1
+
+    await hub.async_shutdown()
+
+
+async def test_offline_device_is_checked_with_backoff(hass: HomeAssistant) -> None:
+    """An offline device is refreshed once, then left alone until its backoff."""
+    hub = PetLibroHub(hass, "entry", {CONF_REGION: "US", CONF_API_TOKEN: "token"})
+    hub.api = api = FakePetLibroAPI()
+    await hub.load_devices()
+
+    api.devices[FEEDER_SERIAL]["online"] = False
+    api.calls.clear()
+    await hub.refresh_devices()
+    assert api.calls["device_real_info"] == 1
+
+    api.calls.clear()
+    await hub.refresh_devices()
+    assert api.calls == {"list_devices": 1}
+    assert not (await hub.get_device(FEEDER_SERIAL)).online
+
+    await hub.async_shutdown()
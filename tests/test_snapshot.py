@@ -0,0 +1,40 @@
+"""Tests for the camera snapshot cache."""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.petlibro.snapshot import Snapshot, SnapshotCache  # noqa: E402
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_clear_keeps_the_newer_fetch_in_flight() -> None:
+    """A fetch cancelled by clear() does not forget the fetch started after it."""
+    gates: list[asyncio.Event] = []
+
+    async def fetch(key: str, previous: Snapshot | None) -> Snapshot:
+        gates.append(gate := asyncio.Event())
+        await gate.wait()
+        return Snapshot(key.encode())
+
+    cache = SnapshotCache(fetch)
+    first = asyncio.create_task(cache.async_get("camera"))
+    while not gates:
+        await asyncio.sleep(0)
+    cache.clear()
+
+    second = asyncio.create_task(cache.async_get("camera"))
+    third = asyncio.create_task(cache.async_get("camera"))
+    # Let the cancelled fetch finish and run its done callback
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    assert "camera" in cache._inflight  # pylint: disable=protected-access
+
+    gates[-1].set()
+    assert await second == await third == b"camera"
+    assert len(gates) == 2
+    with pytest.raises(asyncio.CancelledError):
+        await first
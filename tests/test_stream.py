@@ -0,0 +1,154 @@
+"""Tests for the camera stream relay, against a local fake stream source."""
+
+import asyncio
+from contextlib import aclosing
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.petlibro.stream import StreamRelay  # noqa: E402
+
+pytestmark = pytest.mark.asyncio
+
+
+class FakeStreamSource:
+    """A local frame source counting its upstream connections."""
+
+    def __init__(self) -> None:
+        """Initialize the source."""
+        self.frames: asyncio.Queue[bytes | Exception | None] = asyncio.Queue()
+        self.opened = 0
+        self.closed = 0
+
+    async def stream(self):
+        """Yield the queued frames until None is queued, raise queued errors."""
+        self.opened += 1
+        try:
+            while (frame := await self.frames.get()) is not None:
+                if isinstance(frame, Exception):
+                    raise frame
+                yield frame
+        finally:
+            self.closed += 1
+
+
+async def _collect(relay: StreamRelay, count: int) -> list[bytes]:
+    """Return the first frames received by a consumer."""
+    frames = []
+    async with aclosing(relay.subscribe()) as stream:
+        async for frame in stream:
+            frames.append(frame)
+            if len(frames) == count:
+                break
+    return frames
+
+
+async def _settle() -> None:
+    """Let the relay and its consumers process what is pending."""
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+async def test_consumers_share_one_upstream() -> None:
+    """Every consumer gets the same frame objects from a single upstream."""
+    source = FakeStreamSource()
+    relay = StreamRelay(source.stream, idle_grace=0)
+    consumers = [asyncio.ensure_future(_collect(relay, 3)) for _ in range(3)]
+    await _settle()
+
+    frames = [bytes([index]) * 10 for index in range(3)]
+    for frame in frames:
+        source.frames.put_nowait(frame)
+    results = await asyncio.gather(*consumers)
+
+    assert source.opened == 1
+    for result in results:
+        assert result == frames
+        assert all(got is sent for got, sent in zip(result, frames))
+    relay.close()
+
+
+async def test_slow_consumer_skips_to_oldest_frame() -> None:
+    """A consumer more than a buffer behind drops the frames it missed."""
+    source = FakeStreamSource()
+    relay = StreamRelay(source.stream, buffer_size=4, idle_grace=0)
+    frames = relay.subscribe()
+    first = asyncio.ensure_future(frames.__anext__())
+    await _settle()
+
+    for index in range(10):
+        source.frames.put_nowait(bytes([index]))
+    await _settle()
+
+    received = [await first] + [await frames.__anext__() for _ in range(3)]
+    assert received == [bytes([index]) for index in range(6, 10)]
+    assert relay.dropped_frames == 6
+    await frames.aclose()
+    relay.close()
+
+
+async def test_upstream_closed_after_idle_grace() -> None:
+    """The upstream stays open for the grace period after the last consumer."""
+    source = FakeStreamSource()
+    relay = StreamRelay(source.stream, idle_grace=0.05)
+    consumer = asyncio.ensure_future(_collect(relay, 1))
+    await _settle()
+    source.frames.put_nowait(b"frame")
+    await consumer
+
+    assert relay.consumers == 0
+    assert relay.is_open
+    await asyncio.sleep(0.1)
+    assert not relay.is_open
+    await _settle()
+    assert source.closed == 1
+
+
+async def test_end_of_upstream_ends_consumers() -> None:
+    """Consumers stop when the upstream ends."""
+    source = FakeStreamSource()
+    relay = StreamRelay(source.stream, idle_grace=0)
+    consumer = asyncio.ensure_future(_collect(relay, 10))
+    await _settle()
+    source.frames.put_nowait(b"last")
+    source.frames.put_nowait(None)
+
+    assert await asyncio.wait_for(consumer, 1) == [b"last"]
+
+
+async def test_reopen_after_idle_grace() -> None:
+    """A consumer arriving after the idle grace opens a new upstream."""
+    source = FakeStreamSource()
+    relay = StreamRelay(source.stream, idle_grace=0.05)
+    consumer = asyncio.ensure_future(_collect(relay, 1))
+    await _settle()
+    source.frames.put_nowait(b"first")
+    await consumer
+    await asyncio.sleep(0.1)
+    assert not relay.is_open
+
+    consumer = asyncio.ensure_future(_collect(relay, 1))
+    await _settle()
+    source.frames.put_nowait(b"second")
+    assert await asyncio.wait_for(consumer, 1) == [b"second"]
+    assert source.opened == 2
+    relay.close()
+
+
+async def test_reopen_after_upstream_failure() -> None:
+    """A consumer arriving after the upstream failed opens a new upstream."""
+    source = FakeStreamSource()
+    relay = StreamRelay(source.stream, idle_grace=0)
+    consumer = asyncio.ensure_future(_collect(relay, 10))
+    await _settle()
+    source.frames.put_nowait(RuntimeError("Upstream lost"))
+    assert await asyncio.wait_for(consumer, 1) == []
+    assert not relay.is_open
+
+    consumer = asyncio.ensure_future(_collect(relay, 1))
+    await _settle()
+    source.frames.put_nowait(b"frame")
+    assert await asyncio.wait_for(consumer, 1) == [b"frame"]
+    assert source.opened == 2
+    relay.close()
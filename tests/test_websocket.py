@@ -0,0 +1,87 @@
+"""Tests for the live diff subscription, against a fake API."""
+
+from unittest.mock import patch
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from homeassistant.const import CONF_API_TOKEN, CONF_REGION  # noqa: E402
+from homeassistant.core import HomeAssistant  # noqa: E402
+from pytest_homeassistant_custom_component.common import MockConfigEntry  # noqa: E402
+
+from custom_components.petlibro.const import DOMAIN  # noqa: E402
+from custom_components.petlibro.websocket import WS_SUBSCRIBE  # noqa: E402
+
+from .common import FEEDER_SERIAL, FOUNTAIN_SERIAL, FakePetLibroAPI  # noqa: E402
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture(autouse=True)
+def fake_api():
+    """Load the hubs from the fake API and flush the diffs right away."""
+    with (
+        patch(
+            "custom_components.petlibro.hub.PetLibroAPI",
+            lambda *_, **__: FakePetLibroAPI(),
+        ),
+        patch("custom_components.petlibro.websocket.FLUSH_INTERVAL_SECONDS", 0),
+    ):
+        yield
+
+
+async def _setup(hass: HomeAssistant) -> MockConfigEntry:
+    """Set up an entry of the fake account."""
+    entry = MockConfigEntry(
+        domain=DOMAIN, data={CONF_REGION: "US", CONF_API_TOKEN: "token"}
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry
+
+
+async def test_coalesced_changes_are_counted_per_device(
+    hass: HomeAssistant, hass_ws_client
+) -> None:
+    """Each device reports the changes coalesced for itself only."""
+    entry = await _setup(hass)
+    client = await hass_ws_client(hass)
+    await client.send_json({"id": 1, "type": WS_SUBSCRIBE})
+    assert (await client.receive_json())["success"]
+
+    feeder = await entry.runtime_data.get_device(FEEDER_SERIAL)
+    fountain = await entry.runtime_data.get_device(FOUNTAIN_SERIAL)
+    for days in (9, 8, 7):
+        feeder.update_data({"remainingDesiccantDays": days})
+    fountain.update_data({"weightPercent": 50})
+
+    events = {}
+    for _ in range(2):
+        event = (await client.receive_json())["event"]
+        events[event["serial"]] = event
+    assert events[FEEDER_SERIAL]["coalesced"] == 2
+    assert events[FEEDER_SERIAL]["changes"] == {
+        "remainingDesiccantDays": {"old": 10, "new": 7}
+    }
+    assert events[FOUNTAIN_SERIAL]["coalesced"] == 0
+
+
+async def test_subscription_follows_reloaded_hub(
+    hass: HomeAssistant, hass_ws_client
+) -> None:
+    """A subscription keeps streaming the devices of a reloaded entry."""
+    entry = await _setup(hass)
+    client = await hass_ws_client(hass)
+    await client.send_json({"id": 1, "type": WS_SUBSCRIBE, "serials": [FEEDER_SERIAL]})
+    assert (await client.receive_json())["success"]
+
+    assert await hass.config_entries.async_reload(entry.entry_id)
+    await hass.async_block_till_done()
+
+    feeder = await entry.runtime_data.get_device(FEEDER_SERIAL)
+    feeder.update_data({"remainingDesiccantDays": 4})
+    event = (await client.receive_json())["event"]
+    assert event["serial"] == FEEDER_SERIAL
+    assert event["changes"] == {"remainingDesiccantDays": {"old": 10, "new": 4}}